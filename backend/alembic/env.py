@@ -14,7 +14,7 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from app.models.base import Base
 from app.models.user import User
 from app.models.news import News, Category, NewsTransformation
-from app.models.prompt import Prompt, Tag
+from app.models.prompt import Prompt, Tag, PromptCollectionState, PromptStats
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,33 @@
+"""add_prompt_collection_states
+
+Revision ID: 135c85649433
+Revises: 276345c69553
+Create Date: 2026-10-18 15:32:47.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '135c85649433'
+down_revision: Union[str, None] = '276345c69553'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'prompt_collection_states',
+        sa.Column('prompt_id', sa.Integer(), nullable=False),
+        sa.Column('last_published_at', sa.DateTime(), nullable=True),
+        sa.Column('last_collected_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['prompt_id'], ['prompts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('prompt_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('prompt_collection_states')
@@ -0,0 +1,99 @@
+"""add_news_read_path_indexes
+
+Revision ID: 276345c69553
+Revises: 287ef248acb2
+Create Date: 2026-10-18 14:05:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '276345c69553'
+down_revision: Union[str, None] = '287ef248acb2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Columns the collector already writes for each prompt association
+    op.add_column('news_prompts', sa.Column('relevance_score', sa.Float(), nullable=True))
+    op.add_column('news_prompts', sa.Column('meta_info', postgresql.JSON(), nullable=True))
+
+    # Merge news rows sharing a url onto the oldest row before making url unique
+    for table in ('news_prompts', 'news_categories', 'news_transformations'):
+        op.execute(f"""
+            UPDATE {table} SET news_id = dupes.keep_id
+            FROM (
+                SELECT id, MIN(id) OVER (PARTITION BY url) AS keep_id
+                FROM news WHERE url IS NOT NULL
+            ) AS dupes
+            WHERE {table}.news_id = dupes.id AND dupes.id <> dupes.keep_id
+        """)
+    op.execute("""
+        DELETE FROM news USING (
+            SELECT id, MIN(id) OVER (PARTITION BY url) AS keep_id
+            FROM news WHERE url IS NOT NULL
+        ) AS dupes
+        WHERE news.id = dupes.id AND dupes.id <> dupes.keep_id
+    """)
+    op.create_index('ix_news_url', 'news', ['url'], unique=True)
+
+    # Association rows need complete, unique keys before they get primary keys
+    op.execute("DELETE FROM news_prompts WHERE news_id IS NULL OR prompt_id IS NULL")
+    op.execute("""
+        DELETE FROM news_prompts a USING news_prompts b
+        WHERE a.prompt_id = b.prompt_id AND a.news_id = b.news_id AND a.ctid > b.ctid
+    """)
+    op.execute("DELETE FROM news_categories WHERE news_id IS NULL OR category_id IS NULL")
+    op.execute("""
+        DELETE FROM news_categories a USING news_categories b
+        WHERE a.category_id = b.category_id AND a.news_id = b.news_id AND a.ctid > b.ctid
+    """)
+
+    op.alter_column('news_prompts', 'news_id', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('news_prompts', 'prompt_id', existing_type=sa.Integer(), nullable=False)
+    op.create_primary_key('news_prompts_pkey', 'news_prompts', ['prompt_id', 'news_id'])
+    op.create_index(
+        'ix_news_prompts_prompt_id_display_order',
+        'news_prompts',
+        ['prompt_id', 'display_order']
+    )
+
+    op.alter_column('news_categories', 'news_id', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('news_categories', 'category_id', existing_type=sa.Integer(), nullable=False)
+    op.create_primary_key('news_categories_pkey', 'news_categories', ['news_id', 'category_id'])
+    op.create_index(
+        'ix_news_categories_category_id_news_id',
+        'news_categories',
+        ['category_id', 'news_id']
+    )
+
+    op.create_index(
+        'ix_news_transformations_prompt_id_news_id',
+        'news_transformations',
+        ['prompt_id', 'news_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_transformations_prompt_id_news_id', table_name='news_transformations')
+
+    op.drop_index('ix_news_categories_category_id_news_id', table_name='news_categories')
+    op.drop_constraint('news_categories_pkey', 'news_categories', type_='primary')
+    op.alter_column('news_categories', 'category_id', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('news_categories', 'news_id', existing_type=sa.Integer(), nullable=True)
+
+    op.drop_index('ix_news_prompts_prompt_id_display_order', table_name='news_prompts')
+    op.drop_constraint('news_prompts_pkey', 'news_prompts', type_='primary')
+    op.alter_column('news_prompts', 'prompt_id', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('news_prompts', 'news_id', existing_type=sa.Integer(), nullable=True)
+
+    op.drop_index('ix_news_url', table_name='news')
+
+    op.drop_column('news_prompts', 'meta_info')
+    op.drop_column('news_prompts', 'relevance_score')
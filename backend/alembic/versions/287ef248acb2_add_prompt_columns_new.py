@@ -1,8 +1,8 @@
 """add_prompt_columns_new
 
-Revision ID: [leave this as generated]
-Revises: [leave this as generated]
-Create Date: [leave this as generated]
+Revision ID: 287ef248acb2
+Revises: cfcf2e57aa34
+Create Date: 2024-12-09 09:12:00.000000
 
 """
 from typing import Sequence, Union
@@ -12,8 +12,8 @@ import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic
-revision = '[leave as is]'
-down_revision = '[leave as is]'
+revision = '287ef248acb2'
+down_revision = 'cfcf2e57aa34'
 branch_labels = None
 depends_on = None
 
@@ -0,0 +1,59 @@
+"""add_prompt_stats
+
+Revision ID: 318ae981c36a
+Revises: 135c85649433
+Create Date: 2026-10-18 16:10:26.537219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '318ae981c36a'
+down_revision: Union[str, None] = '135c85649433'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'prompt_stats',
+        sa.Column('prompt_id', sa.Integer(), nullable=False),
+        sa.Column('total_articles', sa.Integer(), nullable=False),
+        sa.Column('latest_refresh', sa.DateTime(), nullable=True),
+        sa.Column('categories_summary', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['prompt_id'], ['prompts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('prompt_id')
+    )
+
+    # Backfill from the existing associations
+    op.execute("""
+        INSERT INTO prompt_stats (prompt_id, total_articles, latest_refresh, categories_summary, updated_at)
+        SELECT
+            np.prompt_id,
+            COUNT(*),
+            MAX(n.created_at),
+            COALESCE((
+                SELECT json_object_agg(counts.name, counts.article_count)
+                FROM (
+                    SELECT c.name, COUNT(*) AS article_count
+                    FROM news_prompts np2
+                    JOIN news_categories nc ON nc.news_id = np2.news_id
+                    JOIN categories c ON c.id = nc.category_id
+                    WHERE np2.prompt_id = np.prompt_id
+                    GROUP BY c.name
+                ) AS counts
+            ), '{}'::json),
+            now()
+        FROM news_prompts np
+        JOIN news n ON n.id = np.news_id
+        GROUP BY np.prompt_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('prompt_stats')
@@ -0,0 +1,29 @@
+"""add_prompt_feed_version
+
+Revision ID: 7057936da4ff
+Revises: e3e2dcbbd62d
+Create Date: 2026-10-18 17:21:44.630918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7057936da4ff'
+down_revision: Union[str, None] = 'e3e2dcbbd62d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'prompt_stats',
+        sa.Column('feed_version', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('prompt_stats', 'feed_version')
@@ -0,0 +1,37 @@
+"""add_news_id_to_feed_order_index
+
+Revision ID: e3e2dcbbd62d
+Revises: 318ae981c36a
+Create Date: 2026-10-18 16:48:03.116472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3e2dcbbd62d'
+down_revision: Union[str, None] = '318ae981c36a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Feed pages are keyed on (display_order, news_id) within a prompt
+    op.drop_index('ix_news_prompts_prompt_id_display_order', table_name='news_prompts')
+    op.create_index(
+        'ix_news_prompts_prompt_id_display_order',
+        'news_prompts',
+        ['prompt_id', 'display_order', 'news_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_prompts_prompt_id_display_order', table_name='news_prompts')
+    op.create_index(
+        'ix_news_prompts_prompt_id_display_order',
+        'news_prompts',
+        ['prompt_id', 'display_order']
+    )
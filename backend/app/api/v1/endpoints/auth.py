@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.core.auth import create_access_token, get_password_hash, verify_password
-from app.db.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.auth import create_access_token, verify_password_async
+from app.db.database import get_async_db
 from app.models.user import User
 from app.schemas.token import Token
 import logging
@@ -13,13 +14,13 @@ router = APIRouter()
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Log login attempt
     logger.info(f"Login attempt for username: {form_data.username}")
     
     # Find user
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
     if not user:
         logger.warning(f"User not found: {form_data.username}")
         raise HTTPException(
@@ -29,7 +30,7 @@ async def login_for_access_token(
         )
 
     # Verify password
-    if not verify_password(form_data.password, user.hashed_password):
+    if not await verify_password_async(form_data.password, user.hashed_password):
         logger.warning(f"Invalid password for user: {form_data.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,31 +1,273 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from celery.result import AsyncResult
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, selectinload
+from sqlalchemy import Select, and_, func, or_, select, tuple_, update
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from datetime import datetime
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import uuid
+from app.db.database import AsyncSessionLocal, get_async_db
 from app.schemas import news as news_schemas
 from app.schemas.user import User  # Changed to direct import
-from app.models.news import News, Category, news_categories, news_prompts
-from app.models.prompt import Prompt
+from app.models.news import News, Category, NewsTransformation, news_categories, news_prompts
+from app.models.prompt import Prompt, PromptStats
 from app.core.news_engine import NewsEngine
-from app.services.news_collector import NewsCollector
+from app.core.llm.base import BaseLLM
+from app.core.llm.factory import LLMFactory
+from app.services.cache import get_redis
+from app.services.feed_snapshots import read_feed_page
+from app.services.news_collector import get_provider_semaphore
+from app.services.tasks import refresh_prompt_news as refresh_prompt_news_task
+from app.core.celery_app import celery_app
 from app.core.auth import get_current_user
+from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
+settings = get_settings()
 
-@router.get("/prompt/{prompt_id}", response_model=List[news_schemas.NewsInPrompt])
+def _refresh_job_key(job_id: str) -> str:
+    return f"news:refresh:job:{job_id}"
+
+async def _enqueue_refresh(prompt_id: int) -> str:
+    """Queue a background refresh for a prompt and return its job id"""
+    job_id = str(uuid.uuid4())
+    # Recorded before queueing so the job can only be polled through its prompt
+    await get_redis().set(_refresh_job_key(job_id), prompt_id, ex=settings.REFRESH_JOB_RESULT_TTL)
+    await run_in_threadpool(
+        refresh_prompt_news_task.apply_async, args=(prompt_id,), task_id=job_id
+    )
+    return job_id
+
+def _feed_cache_headers(request: Request, prompt: Prompt, stats: Optional[PromptStats]) -> Dict[str, str]:
+    """
+    Build caching headers for a feed response. The ETag covers the
+    prompt's feed version and the query parameters that shape the page.
+    """
+    params = sorted(
+        (key, value)
+        for key, value in request.query_params.multi_items()
+        if key != "refresh"
+    )
+    payload = json.dumps([
+        request.url.path,
+        stats.feed_version if stats else 0,
+        stats.updated_at.isoformat() if stats and stats.updated_at else None,
+        params
+    ])
+    headers = {"ETag": f'"{hashlib.sha256(payload.encode()).hexdigest()[:32]}"'}
+    if prompt.is_public:
+        headers["Cache-Control"] = f"public, max-age={settings.FEED_CACHE_MAX_AGE}"
+    else:
+        headers["Cache-Control"] = "private, no-cache"
+    return headers
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already holds this ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+async def _snapshot_page(
+    stats: Optional[PromptStats],
+    response: Response,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    schema: type,
+    fields: Optional[Set[str]],
+    category: Optional[str] = None
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Serve a feed page from the prompt's Redis snapshot, or return None to
+    fall back to the database
+    """
+    if stats is None:
+        return None
+
+    page = await read_feed_page(
+        stats.prompt_id,
+        stats.feed_version,
+        skip,
+        limit,
+        position=_decode_cursor(cursor) if cursor else None,
+        category=category
+    )
+    if page is None:
+        return None
+
+    if page.next_position:
+        response.headers["X-Next-Cursor"] = _encode_cursor(*page.next_position)
+
+    # Snapshots hold full NewsInPrompt payloads; keep what the view asks for
+    keep = fields or set(schema.model_fields)
+    return [{key: value for key, value in item.items() if key in keep} for item in page.items]
+
+def _encode_cursor(display_order: Optional[int], news_id: int) -> str:
+    """Encode a feed position as an opaque cursor"""
+    payload = json.dumps([display_order, news_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[int], int]:
+    """Decode a cursor produced by _encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        display_order, news_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (None if display_order is None else int(display_order)), int(news_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def _parse_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """Validate a comma-separated fields parameter against NewsInPrompt"""
+    if not fields:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(news_schemas.NewsInPrompt.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return requested | {"id"}
+
+def _feed_schema(view: news_schemas.NewsView, fields: Optional[Set[str]]) -> type:
+    """Pick the smallest schema that covers the requested view or fields"""
+    if fields is not None:
+        if fields <= set(news_schemas.NewsSummary.model_fields):
+            return news_schemas.NewsSummary
+        return news_schemas.NewsInPrompt
+    if view == news_schemas.NewsView.full:
+        return news_schemas.NewsInPrompt
+    return news_schemas.NewsSummary
+
+def _feed_query(prompt_id: int, full: bool = True) -> Select:
+    """
+    Select a prompt's news with categories and the prompt's own
+    transformations loaded in batch alongside the page. Summary queries
+    skip the transformations and leave the article bodies unloaded.
+    """
+    options = [selectinload(News.categories)]
+    if full:
+        options.append(selectinload(
+            News.transformations.and_(NewsTransformation.prompt_id == prompt_id)
+        ))
+    else:
+        options.extend([defer(News.content), defer(News.raw_data), defer(News.meta_info)])
+
+    return select(News).join(
+        news_prompts
+    ).options(
+        *options
+    ).where(
+        news_prompts.c.prompt_id == prompt_id
+    )
+
+def _with_association_columns(query: Select) -> Select:
+    """Add the prompt's news_prompts columns to a news query"""
+    return query.add_columns(
+        news_prompts.c.display_order,
+        news_prompts.c.relevance_score,
+        news_prompts.c.meta_info
+    )
+
+def _project_row(row: Any) -> News:
+    """Copy the projected association columns onto the news item"""
+    news = row.News
+    news.display_order = row.display_order
+    news.relevance_score = row.relevance_score
+    news.prompt_specific_meta = row.meta_info
+    return news
+
+def _render_feed(news_items: List[News], schema: type, fields: Optional[Set[str]]) -> List[Dict[str, Any]]:
+    """Serialize feed items with the chosen schema, keeping only the requested fields"""
+    return [
+        schema.model_validate(news).model_dump(mode="json", include=fields)
+        for news in news_items
+    ]
+
+async def _fetch_feed_page(
+    db: AsyncSession,
+    query: Select,
+    response: Response,
+    skip: int,
+    limit: int,
+    cursor: Optional[str]
+) -> List[News]:
+    """
+    Run a feed query ordered by (display_order, news_id), with unordered
+    news last. Pages after the cursor when one is given, otherwise by
+    offset. The cursor for the next page, if any, is returned in the
+    X-Next-Cursor header. The prompt's association columns are projected
+    onto each returned news item.
+    """
+    query = _with_association_columns(query).order_by(
+        news_prompts.c.display_order.asc().nulls_last(),
+        news_prompts.c.news_id
+    )
+    if cursor:
+        display_order, news_id = _decode_cursor(cursor)
+        unordered = news_prompts.c.display_order.is_(None)
+        if display_order is None:
+            query = query.where(and_(unordered, news_prompts.c.news_id > news_id))
+        else:
+            # Row values never compare greater than NULL, so unordered news is added explicitly
+            position = tuple_(news_prompts.c.display_order, news_prompts.c.news_id)
+            query = query.where(or_(position > tuple_(display_order, news_id), unordered))
+    else:
+        query = query.offset(skip)
+
+    # One extra row tells whether there is a next page
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    page = rows[:limit]
+    if page and len(rows) > limit:
+        last = page[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(last.display_order, last.News.id)
+
+    return [_project_row(row) for row in page]
+
+@router.get(
+    "/prompt/{prompt_id}",
+    response_model=None,
+    responses={200: {"model": List[news_schemas.NewsSummary]}}
+)
 async def get_prompt_news(
     prompt_id: int,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    view: news_schemas.NewsView = news_schemas.NewsView.summary,
+    fields: Optional[str] = Query(None, description="Comma-separated NewsInPrompt fields to return"),
     refresh: bool = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)  # Using directly imported User
 ):
-    """Get news for a specific prompt-newspaper"""
+    """
+    Get news for a specific prompt-newspaper. Pass the X-Next-Cursor header
+    of a response as cursor to get the following page. Items use the
+    summary schema unless view=full or fields asks for more. Requests
+    with a matching If-None-Match get 304 Not Modified.
+    """
+    requested_fields = _parse_fields(fields)
+    schema = _feed_schema(view, requested_fields)
     
     # Verify prompt access
-    prompt = db.query(Prompt).filter(Prompt.id == prompt_id).first()
+    prompt = await db.get(Prompt, prompt_id)
     if not prompt:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -38,32 +280,39 @@ async def get_prompt_news(
             detail="Not authorized to access this prompt's news"
         )
 
-    # Initialize collector
-    collector = NewsCollector(db)
-    
-    # Refresh news if requested
+    # Queue a refresh if requested; the current news is returned meanwhile
     if refresh:
-        await collector.collect_news_for_prompt(prompt_id)
+        response.headers["X-Refresh-Job-Id"] = await _enqueue_refresh(prompt_id)
+
+    # Unchanged feeds are answered before any news rows are loaded
+    stats = await db.get(PromptStats, prompt_id)
+    cache_headers = _feed_cache_headers(request, prompt, stats)
+    if _not_modified(request, cache_headers["ETag"]):
+        if refresh:
+            cache_headers["X-Refresh-Job-Id"] = response.headers["X-Refresh-Job-Id"]
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    response.headers.update(cache_headers)
+
+    snapshot = await _snapshot_page(stats, response, skip, limit, cursor, schema, requested_fields)
+    if snapshot is not None:
+        return snapshot
     
     # Get news with prompt-specific metadata
-    news_items = db.query(News).join(
-        news_prompts
-    ).filter(
-        news_prompts.c.prompt_id == prompt_id
-    ).order_by(
-        news_prompts.c.display_order
-    ).offset(skip).limit(limit).all()
-    
-    return news_items
+    news_items = await _fetch_feed_page(
+        db,
+        _feed_query(prompt_id, full=schema is news_schemas.NewsInPrompt),
+        response, skip, limit, cursor
+    )
+    return _render_feed(news_items, schema, requested_fields)
 
 @router.get("/prompt/{prompt_id}/categories", response_model=List[str])
 async def get_prompt_categories(
     prompt_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get available categories in a prompt-newspaper"""
-    prompt = db.query(Prompt).filter(Prompt.id == prompt_id).first()
+    prompt = await db.get(Prompt, prompt_id)
     if not prompt or (not prompt.is_public and prompt.user_id != current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -71,65 +320,279 @@ async def get_prompt_categories(
         )
     
     # Get unique categories for this prompt's news
-    categories = db.query(Category.name).distinct().join(
-        news_categories
-    ).join(
-        News
-    ).join(
-        news_prompts
-    ).filter(
-        news_prompts.c.prompt_id == prompt_id
-    ).all()
+    categories = (await db.execute(
+        select(Category.name).distinct().join(
+            news_categories
+        ).join(
+            News
+        ).join(
+            news_prompts
+        ).where(
+            news_prompts.c.prompt_id == prompt_id
+        )
+    )).all()
     
     return [cat[0] for cat in categories]
 
-@router.get("/prompt/{prompt_id}/category/{category}", response_model=List[news_schemas.NewsInPrompt])
+@router.get(
+    "/prompt/{prompt_id}/category/{category}",
+    response_model=None,
+    responses={200: {"model": List[news_schemas.NewsSummary]}}
+)
 async def get_prompt_news_by_category(
     prompt_id: int,
     category: str,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    view: news_schemas.NewsView = news_schemas.NewsView.summary,
+    fields: Optional[str] = Query(None, description="Comma-separated NewsInPrompt fields to return"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get category-specific news from a prompt-newspaper"""
-    prompt = db.query(Prompt).filter(Prompt.id == prompt_id).first()
+    requested_fields = _parse_fields(fields)
+    schema = _feed_schema(view, requested_fields)
+
+    prompt = await db.get(Prompt, prompt_id)
     if not prompt or (not prompt.is_public and prompt.user_id != current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Prompt not found or access denied"
         )
+
+    stats = await db.get(PromptStats, prompt_id)
+    cache_headers = _feed_cache_headers(request, prompt, stats)
+    if _not_modified(request, cache_headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    response.headers.update(cache_headers)
+
+    snapshot = await _snapshot_page(
+        stats, response, skip, limit, cursor, schema, requested_fields, category=category
+    )
+    if snapshot is not None:
+        return snapshot
     
-    news_items = db.query(News).join(
-        news_prompts
-    ).join(
-        news_categories
-    ).join(
-        Category
-    ).filter(
-        news_prompts.c.prompt_id == prompt_id,
-        Category.slug == category
-    ).order_by(
-        news_prompts.c.display_order
-    ).offset(skip).limit(limit).all()
-    
-    return news_items
-
-@router.post("/prompt/{prompt_id}/refresh", response_model=dict)
+    news_items = await _fetch_feed_page(
+        db,
+        _feed_query(prompt_id, full=schema is news_schemas.NewsInPrompt).join(
+            news_categories, news_categories.c.news_id == News.id
+        ).join(
+            Category
+        ).where(
+            Category.slug == category
+        ),
+        response, skip, limit, cursor
+    )
+    return _render_feed(news_items, schema, requested_fields)
+
+@router.get("/prompt/{prompt_id}/article/{news_id}", response_model=news_schemas.NewsInPrompt)
+async def get_prompt_article(
+    prompt_id: int,
+    news_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the full body of one article in a prompt-newspaper"""
+    prompt = await db.get(Prompt, prompt_id)
+    if not prompt or (not prompt.is_public and prompt.user_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Prompt not found or access denied"
+        )
+    
+    row = (await db.execute(
+        _with_association_columns(_feed_query(prompt_id)).where(News.id == news_id)
+    )).first()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Article not found in this prompt"
+        )
+    
+    return _project_row(row)
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def _stream_transformation(llm: BaseLLM, news: News, prompt: Prompt) -> AsyncIterator[str]:
+    """
+    Stream a transformation as token events, then persist it and finish
+    with a done event carrying the stored NewsTransformation
+    """
+    parts = []
+    metadata: Dict[str, Any] = {}
+    provider = prompt.llm_provider or settings.LLM_PROVIDER
+    # Chunks, then an exception if generation failed, then None
+    chunks: asyncio.Queue = asyncio.Queue()
+
+    async def generate():
+        # Shares the provider's concurrency limit with background refreshes.
+        # Chunks are buffered, so a slow client doesn't keep the slot.
+        try:
+            async with get_provider_semaphore(provider):
+                async for chunk in llm.generate_stream(
+                    prompt=prompt.prompt_text,
+                    system_prompt=prompt.system_prompt,
+                    content=news.content
+                ):
+                    chunks.put_nowait(chunk)
+        except Exception as e:
+            chunks.put_nowait(e)
+        finally:
+            chunks.put_nowait(None)
+
+    generator = asyncio.create_task(generate())
+    try:
+        while (chunk := await chunks.get()) is not None:
+            if isinstance(chunk, Exception):
+                raise chunk
+            metadata.update(chunk.metadata)
+            if chunk.content:
+                parts.append(chunk.content)
+                yield _sse("token", {"content": chunk.content})
+    except Exception as e:
+        logger.error(f"Error streaming transformation of news {news.id} for prompt {prompt.id}: {e}")
+        yield _sse("error", {"detail": str(e)})
+        return
+    finally:
+        # Stops generation if the client disconnected
+        generator.cancel()
+        await asyncio.gather(generator, return_exceptions=True)
+
+    try:
+        # The request's session may already be gone once the body is streaming
+        async with AsyncSessionLocal() as db:
+            transformation = NewsTransformation(
+                news_id=news.id,
+                prompt_id=prompt.id,
+                transformed_content="".join(parts),
+                llm_provider=provider,
+                meta_info=metadata
+            )
+            db.add(transformation)
+            # Full feed views include the prompt's transformations
+            await db.execute(
+                update(PromptStats).where(
+                    PromptStats.prompt_id == prompt.id
+                ).values(
+                    feed_version=PromptStats.feed_version + 1,
+                    updated_at=datetime.utcnow()
+                )
+            )
+            await db.commit()
+            await db.refresh(transformation)
+    except Exception as e:
+        logger.error(f"Error storing transformation of news {news.id} for prompt {prompt.id}: {e}")
+        yield _sse("error", {"detail": "Could not store the transformation"})
+        return
+
+    yield _sse(
+        "done",
+        news_schemas.NewsTransformation.model_validate(transformation).model_dump(mode="json")
+    )
+
+@router.post("/prompt/{prompt_id}/article/{news_id}/transform")
+async def stream_article_transformation(
+    prompt_id: int,
+    news_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Transform an article with the prompt's LLM, streaming tokens as
+    Server-Sent Events as they are generated. The transformation is
+    stored once the stream completes.
+    """
+    prompt = await db.get(Prompt, prompt_id)
+    if not prompt or (not prompt.is_public and prompt.user_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Prompt not found or access denied"
+        )
+    
+    if prompt.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to transform news for this prompt"
+        )
+    
+    news = await db.get(News, news_id)
+    if not news:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="News not found"
+        )
+    
+    try:
+        llm = LLMFactory.create(provider=prompt.llm_provider, llm_config=prompt.llm_config)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return StreamingResponse(
+        _stream_transformation(llm, news, prompt),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/prompt/{prompt_id}/refresh", response_model=dict, status_code=status.HTTP_202_ACCEPTED)
 async def refresh_prompt_news(
     prompt_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue a manual refresh of news for a prompt-newspaper"""
+    prompt = await db.get(Prompt, prompt_id)
+    if not prompt or (not prompt.is_public and prompt.user_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Prompt not found or access denied"
+        )
+    
+    job_id = await _enqueue_refresh(prompt_id)
+    
+    return {"status": "queued", "message": "News refresh queued", "job_id": job_id}
+
+@router.get("/prompt/{prompt_id}/refresh/{job_id}", response_model=news_schemas.RefreshJob)
+async def get_refresh_status(
+    prompt_id: int,
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Manually refresh news for a prompt-newspaper"""
-    prompt = db.query(Prompt).filter(Prompt.id == prompt_id).first()
+    """Get the progress of a queued news refresh"""
+    prompt = await db.get(Prompt, prompt_id)
     if not prompt or (not prompt.is_public and prompt.user_id != current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Prompt not found or access denied"
         )
     
-    collector = NewsCollector(db)
-    await collector.collect_news_for_prompt(prompt_id)
+    job_prompt_id = await get_redis().get(_refresh_job_key(job_id))
+    if job_prompt_id is None or int(job_prompt_id) != prompt_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Refresh job not found"
+        )
+    
+    result = AsyncResult(job_id, app=celery_app)
+    job_status, info = await run_in_threadpool(lambda: (result.state, result.info))
     
-    return {"status": "success", "message": "News refreshed successfully"}
\ No newline at end of file
+    progress = info if isinstance(info, dict) else {}
+    return news_schemas.RefreshJob(
+        job_id=job_id,
+        prompt_id=prompt_id,
+        status=job_status,
+        fetched=progress.get("fetched", 0),
+        processed=progress.get("processed", 0),
+        failed=progress.get("failed", 0),
+        stored=progress.get("stored", 0),
+        skipped=progress.get("skipped", 0),
+        error=str(info) if job_status == "FAILURE" else None
+    )
\ No newline at end of file
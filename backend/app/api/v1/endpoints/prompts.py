@@ -1,21 +1,53 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload
+from sqlalchemy import delete, select
 from typing import List, Optional
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.schemas import prompt as prompt_schemas
 from app.schemas import user as user_schemas
-from app.models.prompt import Prompt, Tag
-from app.models.news import News, Category, news_categories, news_prompts
+from app.models.prompt import Prompt, PromptStats, Tag
+from app.models.news import news_prompts
 from app.core.auth import get_current_user
 from datetime import datetime
 
 router = APIRouter()
 
+async def _get_prompt(db: AsyncSession, prompt_id: int) -> Optional[Prompt]:
+    """Load a prompt with its tags; news items are served by the news endpoints"""
+    return await db.scalar(
+        select(Prompt).options(
+            selectinload(Prompt.tags),
+            noload(Prompt.news_items)
+        ).where(Prompt.id == prompt_id)
+    )
+
+async def _load_prompt_stats(db: AsyncSession, prompts: List[Prompt]) -> None:
+    """
+    Set newspaper statistics on each prompt from the materialized
+    prompt_stats rows, in one primary-key lookup for the whole page
+    """
+    prompt_ids = [prompt.id for prompt in prompts]
+    if not prompt_ids:
+        return
+
+    stats_by_prompt = {
+        stats.prompt_id: stats
+        for stats in await db.scalars(
+            select(PromptStats).where(PromptStats.prompt_id.in_(prompt_ids))
+        )
+    }
+
+    for prompt in prompts:
+        stats = stats_by_prompt.get(prompt.id)
+        prompt.total_articles = stats.total_articles if stats else 0
+        prompt.latest_refresh = (stats.latest_refresh if stats else None) or prompt.created_at
+        prompt.categories_summary = (stats.categories_summary if stats else None) or {}
+
 @router.post("/", response_model=prompt_schemas.Prompt)
 async def create_prompt(
     prompt: prompt_schemas.PromptCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: user_schemas.User = Depends(get_current_user)
 ):
     """Create a new prompt-newspaper"""
@@ -38,58 +70,33 @@ async def create_prompt(
     )
     
     if prompt.tag_ids:
-        tags = db.query(Tag).filter(Tag.id.in_(prompt.tag_ids)).all()
-        db_prompt.tags = tags
+        tags = (await db.scalars(select(Tag).where(Tag.id.in_(prompt.tag_ids)))).all()
+        db_prompt.tags = list(tags)
     
     db.add(db_prompt)
-    db.commit()
-    db.refresh(db_prompt)
-    return db_prompt
+    await db.commit()
+    return await _get_prompt(db, db_prompt.id)
 
 @router.get("/", response_model=List[prompt_schemas.PromptNewspaper])
 async def read_prompts(
     skip: int = 0,
     limit: int = 10,
     include_stats: bool = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: user_schemas.User = Depends(get_current_user)
 ):
     """Get all prompt-newspapers for current user"""
-    prompts = db.query(Prompt).filter(
-        (Prompt.user_id == current_user.id) | (Prompt.is_public == True)
-    ).offset(skip).limit(limit).all()
+    prompts = (await db.scalars(
+        select(Prompt).options(
+            selectinload(Prompt.tags),
+            noload(Prompt.news_items)
+        ).where(
+            (Prompt.user_id == current_user.id) | (Prompt.is_public == True)
+        ).offset(skip).limit(limit)
+    )).all()
     
     if include_stats:
-        for prompt in prompts:
-            # Add newspaper statistics
-            prompt.total_articles = db.query(func.count(news_prompts.c.news_id)).filter(
-                news_prompts.c.prompt_id == prompt.id
-            ).scalar()
-            
-            # Get latest refresh time
-            prompt.latest_refresh = db.query(func.max(News.created_at)).join(
-                news_prompts
-            ).filter(
-                news_prompts.c.prompt_id == prompt.id
-            ).scalar() or prompt.created_at
-            
-            # Get category summary
-            categories = db.query(
-                Category.name,
-                func.count(news_categories.c.news_id).label('count')
-            ).join(
-                news_categories
-            ).join(
-                News
-            ).join(
-                news_prompts
-            ).filter(
-                news_prompts.c.prompt_id == prompt.id
-            ).group_by(
-                Category.name
-            ).all()
-            
-            prompt.categories_summary = {cat.name: cat.count for cat in categories}
+        await _load_prompt_stats(db, prompts)
     
     return prompts
 
@@ -97,11 +104,11 @@ async def read_prompts(
 async def read_prompt(
     prompt_id: int,
     include_stats: bool = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: user_schemas.User = Depends(get_current_user)
 ):
     """Get a specific prompt-newspaper"""
-    prompt = db.query(Prompt).filter(Prompt.id == prompt_id).first()
+    prompt = await _get_prompt(db, prompt_id)
     if not prompt:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -115,33 +122,7 @@ async def read_prompt(
         )
     
     if include_stats:
-        # Add newspaper statistics (same as in read_prompts)
-        prompt.total_articles = db.query(func.count(news_prompts.c.news_id)).filter(
-            news_prompts.c.prompt_id == prompt.id
-        ).scalar()
-        
-        prompt.latest_refresh = db.query(func.max(News.created_at)).join(
-            news_prompts
-        ).filter(
-            news_prompts.c.prompt_id == prompt.id
-        ).scalar() or prompt.created_at
-        
-        categories = db.query(
-            Category.name,
-            func.count(news_categories.c.news_id).label('count')
-        ).join(
-            news_categories
-        ).join(
-            News
-        ).join(
-            news_prompts
-        ).filter(
-            news_prompts.c.prompt_id == prompt.id
-        ).group_by(
-            Category.name
-        ).all()
-        
-        prompt.categories_summary = {cat.name: cat.count for cat in categories}
+        await _load_prompt_stats(db, [prompt])
     
     return prompt
 
@@ -149,11 +130,11 @@ async def read_prompt(
 async def update_prompt(
     prompt_id: int,
     prompt_update: prompt_schemas.PromptUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: user_schemas.User = Depends(get_current_user)
 ):
     """Update a prompt-newspaper"""
-    db_prompt = db.query(Prompt).filter(Prompt.id == prompt_id).first()
+    db_prompt = await _get_prompt(db, prompt_id)
     if not db_prompt:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -169,23 +150,22 @@ async def update_prompt(
     # Update prompt fields
     for key, value in prompt_update.dict(exclude_unset=True).items():
         if key == 'tag_ids' and value is not None:
-            tags = db.query(Tag).filter(Tag.id.in_(value)).all()
-            db_prompt.tags = tags
+            tags = (await db.scalars(select(Tag).where(Tag.id.in_(value)))).all()
+            db_prompt.tags = list(tags)
         else:
             setattr(db_prompt, key, value)
     
-    db.commit()
-    db.refresh(db_prompt)
-    return db_prompt
+    await db.commit()
+    return await _get_prompt(db, prompt_id)
 
 @router.delete("/{prompt_id}")
 async def delete_prompt(
     prompt_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: user_schemas.User = Depends(get_current_user)
 ):
     """Delete a prompt-newspaper"""
-    db_prompt = db.query(Prompt).filter(Prompt.id == prompt_id).first()
+    db_prompt = await _get_prompt(db, prompt_id)
     if not db_prompt:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -198,7 +178,10 @@ async def delete_prompt(
             detail="Not authorized to delete this prompt"
         )
     
-    db.delete(db_prompt)
-    db.commit()
+    # Remove the prompt's news associations and stats along with it
+    await db.execute(delete(news_prompts).where(news_prompts.c.prompt_id == prompt_id))
+    await db.execute(delete(PromptStats).where(PromptStats.prompt_id == prompt_id))
+    await db.delete(db_prompt)
+    await db.commit()
     
     return {"message": "Prompt-newspaper deleted successfully"}
\ No newline at end of file
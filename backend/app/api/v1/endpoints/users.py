@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, User as UserSchema
-from app.core.auth import get_password_hash, get_current_user
+from app.core.auth import get_password_hash_async, get_current_user, invalidate_cached_user
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,11 +15,11 @@ router = APIRouter()
 @router.post("/", response_model=UserSchema)
 async def create_user(
     user: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         # Check if user exists
-        db_user = db.query(User).filter(User.email == user.email).first()
+        db_user = await db.scalar(select(User).where(User.email == user.email))
         if db_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -26,7 +27,7 @@ async def create_user(
             )
         
         # Create new user with properly hashed password
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await get_password_hash_async(user.password)
         db_user = User(
             email=user.email,
             hashed_password=hashed_password,
@@ -36,13 +37,17 @@ async def create_user(
         )
         
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         
         return db_user
+    except HTTPException:
+        # Keep deliberate responses such as 503 Retry-After when hashing is saturated
+        await db.rollback()
+        raise
     except Exception as e:
         logger.error(f"Error creating user: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating user: {str(e)}"
@@ -58,13 +63,22 @@ async def read_users_me(
 async def update_user_me(
     user_update: UserUpdate,
     current_user: UserSchema = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_user = db.query(User).filter(User.id == current_user.id).first()
+    db_user = await db.get(User, current_user.id)
     
     for key, value in user_update.dict(exclude_unset=True).items():
-        setattr(db_user, key, value)
+        if key == 'password':
+            # Only the hash is stored
+            if value:
+                db_user.hashed_password = await get_password_hash_async(value)
+        else:
+            setattr(db_user, key, value)
     
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    
+    # The token subject is the email, which may have just changed
+    await invalidate_cached_user(current_user.email)
+    await invalidate_cached_user(db_user.email)
     return db_user
\ No newline at end of file
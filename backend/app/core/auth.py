@@ -1,17 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, TypeVar
+import asyncio
+import hashlib
+import weakref
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import get_settings
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.models.user import User
 from app.schemas.user import User as UserSchema  # Updated import
+from app.services.cache import TieredCache
 
 settings = get_settings()
 
+# Validated users by token subject, so most requests skip the users query.
+# Kept in Redis only, so an invalidation reaches every process at once.
+_user_cache = TieredCache(
+    namespace="auth:user",
+    ttl=settings.AUTH_USER_CACHE_TTL,
+    memory_size=0
+)
+
+def _user_cache_key(subject: str) -> str:
+    # Emails are stored case-sensitively, so the subject is used as is
+    return hashlib.sha256(subject.encode("utf-8")).hexdigest()
+
+async def invalidate_cached_user(subject: str) -> None:
+    """
+    Drops a user from the auth cache after their record changes
+    """
+    await _user_cache.delete(_user_cache_key(subject))
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
@@ -22,6 +46,70 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+T = TypeVar("T")
+
+# bcrypt releases the GIL, so a few threads hash in parallel without
+# blocking the event loop; the semaphore bounds how many requests queue up
+_password_executor: Optional[ThreadPoolExecutor] = None
+# Semaphores are bound to the loop they're first used on, so each loop gets its own
+_password_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash"
+        )
+    return _password_executor
+
+def _get_password_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _password_slots.get(loop)
+    if slots is None:
+        slots = _password_slots[loop] = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_PENDING)
+    return slots
+
+def shutdown_password_executor() -> None:
+    """
+    Stops the password hashing threads
+    """
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False)
+        _password_executor = None
+
+async def _run_password_work(func: Callable[..., T], *args) -> T:
+    """
+    Runs a bcrypt call on the password executor. Callers that can't get a
+    slot within PASSWORD_HASH_QUEUE_TIMEOUT get 503 rather than piling up.
+    """
+    slots = _get_password_slots()
+    try:
+        # Unlike wait_for, a timeout here can't fire after the acquire
+        # succeeded, so a slot is never taken without being released
+        async with asyncio.timeout(settings.PASSWORD_HASH_QUEUE_TIMEOUT):
+            await slots.acquire()
+    except TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_password_executor(), func, *args)
+    finally:
+        slots.release()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_work(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_password_work(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -35,7 +123,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> UserSchema:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,16 +139,25 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    cached = await _user_cache.get(_user_cache_key(email))
+    if cached is not None and cached.get("email") == email:
+        current_user = UserSchema.model_validate(cached)
+        if not current_user.is_active:
+            raise credentials_exception
+        return current_user
+    
+    user = await db.scalar(select(User).where(User.email == email))
+    if user is None or user.is_active is False:
         raise credentials_exception
     
-    return UserSchema.model_validate(user)  # Updated to use model_validate
+    current_user = UserSchema.model_validate(user)  # Updated to use model_validate
+    await _user_cache.set(_user_cache_key(email), current_user.model_dump(mode="json"))
+    return current_user
 
 # For development/testing, you can make this optional
 async def get_optional_current_user(
     token: Optional[str] = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Optional[UserSchema]:
     if not token:
         return None
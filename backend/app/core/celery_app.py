@@ -0,0 +1,20 @@
+from celery import Celery
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Run a worker with: celery -A app.core.celery_app worker --loglevel=info
+celery_app = Celery(
+    "app",
+    broker=settings.celery_broker_url,
+    backend=settings.celery_result_backend,
+    include=["app.services.tasks"]
+)
+
+celery_app.conf.update(
+    task_track_started=True,
+    result_expires=settings.REFRESH_JOB_RESULT_TTL,
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+)
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 class Settings(BaseSettings):
     # Project settings
@@ -14,27 +14,86 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     DATABASE_URL: Optional[str] = None
+    DB_ECHO: bool = False  # log every SQL statement
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT: int = 30000  # milliseconds, 0 disables
     
     # Redis
     REDIS_HOST: str
     REDIS_PORT: int
     
+    # Background jobs (defaults to the Redis instance above). Refreshes
+    # always need a worker: they run on the worker process's event loop.
+    CELERY_BROKER_URL: Optional[str] = None
+    CELERY_RESULT_BACKEND: Optional[str] = None
+    REFRESH_JOB_RESULT_TTL: int = 60 * 60 * 24  # seconds
+    REFRESH_LEASE_TTL: int = 60 * 5  # seconds, extended while a refresh runs
+    REFRESH_WAIT_TIMEOUT: int = 60 * 30  # seconds a duplicate refresh waits
+    REFRESH_PROGRESS_INTERVAL: float = 1.0  # seconds between job progress updates
+    
     # LLM Configuration
     LLM_PROVIDER: str = "openai"  # openai, llama, mistral
+    LLM_ADAPTER_CACHE_SIZE: int = 64  # adapters kept per process, by provider and llm_config
     OPENAI_API_KEY: Optional[str] = None
     LOCAL_LLM_URL: Optional[str] = None
     LOCAL_LLM_MODEL: Optional[str] = None
     
+    # OpenAI client
+    OPENAI_MODEL: str = "gpt-4"  # or gpt-3.5-turbo for lower cost
+    OPENAI_TIMEOUT: float = 60.0  # seconds
+    OPENAI_CONNECT_TIMEOUT: float = 10.0  # seconds
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_MAX_RETRIES: int = 2
+    
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 60 * 60 * 24 * 7  # seconds
+    LLM_CACHE_MEMORY_SIZE: int = 1024  # entries kept in-process
+    LLM_CACHE_REDIS_MAX_ENTRIES: int = 100000
+    
     # News API
     NEWS_API_KEY: str
+    NEWS_API_URL: str = "https://newsapi.org/v2/everything"
+    NEWS_API_TIMEOUT: float = 15.0  # seconds
+    NEWS_API_MAX_CONNECTIONS: int = 20
+    NEWS_API_MAX_RETRIES: int = 4
+    NEWS_API_RATE_LIMIT: int = 1000  # requests per key per window
+    NEWS_API_RATE_WINDOW: int = 60 * 60 * 24  # seconds
     
     # Security
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
+    AUTH_USER_CACHE_TTL: int = 60  # seconds an authenticated user is reused
+    PASSWORD_HASH_WORKERS: int = 4  # threads running bcrypt per process
+    PASSWORD_HASH_MAX_PENDING: int = 32  # hashes running or queued at once
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0  # seconds to wait for a slot before 503
     
     # News Collection
     NEWS_UPDATE_INTERVAL: int = 30  # minutes
     NEWS_SOURCES: List[str] = ["newsapi", "reuters"]
+    NEWS_FETCH_CACHE_TTL: int = 60 * 5  # seconds raw query results are shared
+    NEWS_WATERMARK_OVERLAP: int = 60 * 60  # seconds re-requested before a prompt's watermark
+    FEED_CACHE_MAX_AGE: int = 60  # seconds clients may reuse a public prompt's feed
+    FEED_SNAPSHOT_SIZE: int = 500  # leading feed items kept in each Redis snapshot
+    FEED_SNAPSHOT_TTL: int = 60 * 60 * 24 * 7  # seconds
+    
+    # RSS/Atom feeds, grouped by source name as listed in NEWS_SOURCES
+    RSS_FEEDS: Dict[str, List[str]] = {
+        "reuters": ["https://www.reutersagency.com/feed/?taxonomy=best-topics&post_type=best"]
+    }
+    RSS_CONCURRENCY: int = 10  # feeds polled at once
+    RSS_TIMEOUT: float = 15.0  # seconds
+    RSS_STATE_TTL: int = 60 * 60 * 24 * 30  # seconds feed validators are kept
+    
+    # News Processing
+    NEWS_PROCESSING_CONCURRENCY: int = 8  # articles processed at once per refresh
+    LLM_PROVIDER_CONCURRENCY: Dict[str, int] = {"openai": 16, "llama": 2, "mistral": 2}
+    NEWS_STRUCTURED_PROCESSING: bool = True  # one JSON call per article instead of three
     
     class Config:
         env_file = ".env"
@@ -45,6 +104,26 @@ class Settings(BaseSettings):
             return self.DATABASE_URL
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
 
+    @property
+    def async_database_url(self) -> str:
+        url = self.sqlalchemy_database_url
+        for prefix, async_prefix in (
+            ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+            ("postgresql://", "postgresql+asyncpg://"),
+            ("sqlite://", "sqlite+aiosqlite://"),
+        ):
+            if url.startswith(prefix):
+                return async_prefix + url[len(prefix):]
+        return url
+
+    @property
+    def celery_broker_url(self) -> str:
+        return self.CELERY_BROKER_URL or f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/0"
+
+    @property
+    def celery_result_backend(self) -> str:
+        return self.CELERY_RESULT_BACKEND or f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/1"
+
 @lru_cache()
 def get_settings():
     return Settings()
\ No newline at end of file
@@ -1,6 +1,6 @@
 # backend/app/core/llm/base.py
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
 from pydantic import BaseModel
 
 class LLMResponse(BaseModel):
@@ -20,7 +20,33 @@ class BaseLLM(ABC):
         """Generate text based on prompt"""
         pass
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> AsyncIterator[LLMResponse]:
+        """
+        Generate text as a stream of content deltas. The final chunk carries
+        the response metadata. Adapters without native streaming yield the
+        whole completion as one chunk.
+        """
+        response = await self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        yield response
+
     @abstractmethod
     async def health_check(self) -> bool:
         """Check if LLM service is available"""
         pass
+
+    async def close(self) -> None:
+        """Release clients and connections held by the adapter"""
+        pass
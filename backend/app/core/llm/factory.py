@@ -1,9 +1,17 @@
-from typing import Dict, Type
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Type
+import json
+import logging
 from app.core.llm.base import BaseLLM
 from app.core.config import get_settings  # This should now work
 
+logger = logging.getLogger(__name__)
+
 class LLMFactory:
     _adapters: Dict[str, Type[BaseLLM]] = {}
+    # Keyed on llm_config, which prompts control, so only the most
+    # recently used adapters are kept
+    _instances: "OrderedDict[Tuple[str, str], BaseLLM]" = OrderedDict()
     
     @classmethod
     def register_adapter(cls, name: str, adapter: Type[BaseLLM]):
@@ -11,23 +19,55 @@ class LLMFactory:
         cls._adapters[name] = adapter
     
     @classmethod
-    def create(cls, provider: str = None) -> BaseLLM:
-        """Create an instance of the specified LLM adapter"""
+    def create(cls, provider: str = None, llm_config: Optional[Dict[str, Any]] = None) -> BaseLLM:
+        """
+        Return the long-lived adapter for a provider and llm_config,
+        creating it on first use so SDK clients and connections are reused
+        """
         settings = get_settings()
         provider = provider or settings.LLM_PROVIDER
         
         if provider not in cls._adapters:
             raise ValueError(f"Unsupported LLM provider: {provider}")
+
+        key = (provider, json.dumps(llm_config or {}, sort_keys=True, default=str))
+        if key in cls._instances:
+            cls._instances.move_to_end(key)
+            return cls._instances[key]
             
         adapter_class = cls._adapters[provider]
-        return adapter_class()
+        adapter = adapter_class(llm_config=llm_config)
+
+        if settings.LLM_CACHE_ENABLED:
+            # Imported here to avoid a circular import with the cache service
+            from app.services.cache import CachedLLM
+            adapter = CachedLLM(adapter, provider=provider)
+
+        cls._instances[key] = adapter
+        while len(cls._instances) > settings.LLM_ADAPTER_CACHE_SIZE:
+            # Evicted adapters aren't closed: they share the provider's
+            # connection pool and may still be in use by a caller
+            cls._instances.popitem(last=False)
+        return adapter
+
+    @classmethod
+    async def shutdown(cls):
+        """Close every adapter handed out by the factory"""
+        instances = list(cls._instances.values())
+        cls._instances.clear()
+
+        for adapter in instances:
+            try:
+                await adapter.close()
+            except Exception as e:
+                logger.error(f"Error closing LLM adapter: {e}")
 
 # Import and register adapters
 # We'll add these implementations later
-# from app.core.llm.openai import OpenAIAdapter
+from app.core.llm.openai import OpenAILLM
 # from app.core.llm.llama import LlamaAdapter
 # from app.core.llm.mistral import MistralAdapter
 
-# LLMFactory.register_adapter("openai", OpenAIAdapter)
+LLMFactory.register_adapter("openai", OpenAILLM)
 # LLMFactory.register_adapter("llama", LlamaAdapter)
 # LLMFactory.register_adapter("mistral", MistralAdapter)
\ No newline at end of file
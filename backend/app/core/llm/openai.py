@@ -1,53 +1,146 @@
-from typing import Optional, Dict, Any
-from openai import OpenAI
-from .base import LLMBase, LLMResponse
+from typing import AsyncIterator, Optional, Dict, Any, List
+import httpx
+from openai import AsyncOpenAI
+from .base import BaseLLM, LLMResponse
 from app.core.config import get_settings
 
 settings = get_settings()
 
-class OpenAILLM(LLMBase):
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.model = "gpt-4"  # or gpt-3.5-turbo for lower cost
-    
+# One keep-alive connection pool shared by every OpenAI adapter in the process
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the pooled HTTP client used for OpenAI requests
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.OPENAI_TIMEOUT,
+                connect=settings.OPENAI_CONNECT_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    """
+    Closes the pooled HTTP client
+    """
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+class OpenAILLM(BaseLLM):
+    def __init__(self, llm_config: Optional[Dict[str, Any]] = None):
+        llm_config = llm_config or {}
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            http_client=get_http_client()
+        )
+        self.model = llm_config.get("model", settings.OPENAI_MODEL)
+
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str], content: str) -> List[Dict[str, str]]:
+        messages = []
+
+        # Add system prompt if provided
+        if system_prompt:
+            messages.append({
+                "role": "system",
+                "content": system_prompt
+            })
+
+        # Add user content and prompt
+        messages.append({
+            "role": "user",
+            "content": f"{content}\n\nPrompt: {prompt}"
+        })
+        return messages
+
     async def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
         content: str = "",
         **kwargs
     ) -> LLMResponse:
         try:
-            messages = []
-            
-            # Add system prompt if provided
-            if system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
-            
-            # Add user content and prompt
-            messages.append({
-                "role": "user",
-                "content": f"{content}\n\nPrompt: {prompt}"
-            })
-            
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1000
+                messages=self._build_messages(prompt, system_prompt, content),
+                temperature=temperature,
+                max_tokens=max_tokens
             )
-            
+
             return LLMResponse(
                 content=response.choices[0].message.content,
-                meta_info={
+                metadata={
                     "model": self.model,
                     "provider": "openai",
                     "finish_reason": response.choices[0].finish_reason,
                 }
             )
-            
+
+        except Exception as e:
+            raise Exception(f"OpenAI API error: {str(e)}")
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        content: str = "",
+        **kwargs
+    ) -> AsyncIterator[LLMResponse]:
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(prompt, system_prompt, content),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+
+            finish_reason = None
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.delta.content:
+                    yield LLMResponse(content=choice.delta.content)
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+
         except Exception as e:
-            raise Exception(f"OpenAI API error: {str(e)}")
\ No newline at end of file
+            raise Exception(f"OpenAI API error: {str(e)}")
+
+        yield LLMResponse(
+            content="",
+            metadata={
+                "model": self.model,
+                "provider": "openai",
+                "finish_reason": finish_reason,
+                "streamed": True,
+            }
+        )
+
+    async def health_check(self) -> bool:
+        try:
+            await self.client.models.retrieve(self.model)
+            return True
+        except Exception:
+            return False
+
+    async def close(self) -> None:
+        # The connection pool is shared, so closing it is idempotent
+        await close_http_client()
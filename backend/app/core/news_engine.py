@@ -37,7 +37,10 @@ class NewsEngine:
             raise ValueError("News or prompt not found")
 
         # Get appropriate LLM
-        llm = self.llm_factory.create(provider=prompt.llm_provider)
+        llm = self.llm_factory.create(
+            provider=prompt.llm_provider,
+            llm_config=prompt.llm_config
+        )
         
         # Transform content
         response = await llm.generate(
@@ -52,7 +55,7 @@ class NewsEngine:
             prompt_id=prompt_id,
             transformed_content=response.content,
             llm_provider=prompt.llm_provider,
-            metadata=response.metadata
+            meta_info=response.metadata
         )
         
         self.db.add(transformation)
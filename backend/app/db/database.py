@@ -1,7 +1,12 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from typing import Any, AsyncGenerator, Dict
 from app.core.config import get_settings
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -12,16 +17,133 @@ connection_url = settings.sqlalchemy_database_url
 safe_url = connection_url.replace(settings.POSTGRES_PASSWORD, "***") if settings.POSTGRES_PASSWORD else connection_url
 logger.info(f"Connecting to database: {safe_url}")
 
+class PoolWaitStats:
+    """
+    Accumulates how long callers waited to check a connection out of a pool
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_wait_total_ms": self.total_wait * 1000,
+                "checkout_wait_avg_ms": (self.total_wait / self.checkouts * 1000) if self.checkouts else 0.0,
+                "checkout_wait_max_ms": self.max_wait * 1000,
+            }
+
+class _CheckoutTimingMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_stats.record(time.perf_counter() - started)
+
+    def recreate(self):
+        # Keep accumulated stats when the engine recreates its pool
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+def _engine_options(url: str, poolclass: type) -> Dict[str, Any]:
+    """
+    Builds engine keyword arguments from the DB_* settings
+    """
+    options: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.startswith("sqlite"):
+        return options
+
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if settings.DB_STATEMENT_TIMEOUT:
+        if "+asyncpg" in url:
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)}
+            }
+        else:
+            options["connect_args"] = {
+                "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT}"
+            }
+    return options
+
 engine = create_engine(
     settings.sqlalchemy_database_url,
-    echo=True  # This will log all SQL statements
+    **_engine_options(settings.sqlalchemy_database_url, InstrumentedQueuePool)
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the API endpoints so queries don't block the event loop
+async_engine = create_async_engine(
+    settings.async_database_url,
+    **_engine_options(settings.async_database_url, InstrumentedAsyncQueuePool)
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+def _pool_metrics(pool: Pool) -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        metrics.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            in_use=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    if hasattr(pool, "wait_stats"):
+        metrics.update(pool.wait_stats.snapshot())
+    return metrics
+
+def get_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns connection pool gauges for the sync and async engines
+    """
+    return {
+        "sync": _pool_metrics(engine.pool),
+        "async": _pool_metrics(async_engine.sync_engine.pool),
+    }
+
 def get_db() -> Session:
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
@@ -3,7 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
 from app.core.config import get_settings
 from app.models.base import Base
-from app.db.database import engine
+from app.db.database import engine, async_engine, get_pool_metrics
+from app.core.llm.factory import LLMFactory
+from app.core.auth import shutdown_password_executor
+from app.services.cache import close_redis, get_llm_response_cache
+from app.services.sources import newsapi, rss
+import logging
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
@@ -22,11 +29,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Refresh-Job-Id"],
 )
 
+@app.on_event("startup")
+async def startup():
+    # Build the default LLM adapter up front so the first refresh doesn't pay for it
+    try:
+        LLMFactory.create()
+    except Exception as e:
+        logger.warning(f"Could not initialise default LLM adapter: {e}")
+
+@app.on_event("shutdown")
+async def shutdown():
+    await LLMFactory.shutdown()
+    await newsapi.close_http_client()
+    await rss.close_http_client()
+    await close_redis()
+    await async_engine.dispose()
+    shutdown_password_executor()
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/health/db")
+async def database_health():
+    return {"pools": get_pool_metrics()}
+
+@app.get("/health/cache")
+async def cache_health():
+    # Counters are per process, since the last restart
+    return {"llm_responses": get_llm_response_cache().stats()}
\ No newline at end of file
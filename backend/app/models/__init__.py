@@ -1,7 +1,7 @@
 from app.models.base import Base, TimestampMixin
 from app.models.user import User
 from app.models.news import News, Category, NewsTransformation, news_categories
-from app.models.prompt import Prompt, UserNewsPreference
+from app.models.prompt import Prompt, UserNewsPreference, PromptCollectionState, PromptStats
 
 __all__ = [
     "Base",
@@ -12,5 +12,7 @@ __all__ = [
     "NewsTransformation",
     "Prompt",
     "UserNewsPreference",
+    "PromptCollectionState",
+    "PromptStats",
     "news_categories"
 ]
\ No newline at end of file
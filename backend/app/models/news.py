@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table, JSON, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table, JSON, Float, Index
 from sqlalchemy.orm import relationship, backref
 from .base import Base, TimestampMixin
 
@@ -6,17 +6,21 @@ from .base import Base, TimestampMixin
 news_categories = Table(
     'news_categories',
     Base.metadata,
-    Column('news_id', Integer, ForeignKey('news.id')),
-    Column('category_id', Integer, ForeignKey('categories.id'))
+    Column('news_id', Integer, ForeignKey('news.id'), primary_key=True),
+    Column('category_id', Integer, ForeignKey('categories.id'), primary_key=True),
+    Index('ix_news_categories_category_id_news_id', 'category_id', 'news_id')
 )
 
 # Many-to-many relationship table for news prompts
 news_prompts = Table(
     'news_prompts',
     Base.metadata,
-    Column('news_id', Integer, ForeignKey('news.id')),
-    Column('prompt_id', Integer, ForeignKey('prompts.id')),
-    Column('display_order', Integer, nullable=True)
+    Column('prompt_id', Integer, ForeignKey('prompts.id'), primary_key=True),
+    Column('news_id', Integer, ForeignKey('news.id'), primary_key=True),
+    Column('display_order', Integer, nullable=True),
+    Column('relevance_score', Float, nullable=True),
+    Column('meta_info', JSON, nullable=True),
+    Index('ix_news_prompts_prompt_id_display_order', 'prompt_id', 'display_order', 'news_id')
 )
 
 class Category(Base):
@@ -46,7 +50,7 @@ class News(Base, TimestampMixin):
     content = Column(Text, nullable=False)
     summary = Column(Text)
     source = Column(String, nullable=False)
-    url = Column(String)
+    url = Column(String, unique=True, index=True)
     published_at = Column(DateTime, nullable=False)
     image_url = Column(String)
     
@@ -77,6 +81,10 @@ class NewsTransformation(Base, TimestampMixin):
     processing_time = Column(Float)
     meta_info = Column(JSON)
 
+    __table_args__ = (
+        Index('ix_news_transformations_prompt_id_news_id', 'prompt_id', 'news_id'),
+    )
+
     # Relationships
     news = relationship("News", back_populates="transformations")
     prompt = relationship("Prompt", back_populates="transformations")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, JSON, Table
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, JSON, Table, DateTime
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
@@ -66,4 +66,25 @@ class UserNewsPreference(Base, TimestampMixin):
     global_settings = Column(JSON)  # Any global settings for news consumption
     
     # Relationships
-    user = relationship("User", back_populates="news_preferences")
\ No newline at end of file
+    user = relationship("User", back_populates="news_preferences")
+
+class PromptCollectionState(Base):
+    __tablename__ = "prompt_collection_states"
+
+    prompt_id = Column(Integer, ForeignKey("prompts.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Watermark for incremental collection
+    last_published_at = Column(DateTime)  # Newest article published_at seen
+    last_collected_at = Column(DateTime)  # When the last refresh finished
+
+class PromptStats(Base):
+    __tablename__ = "prompt_stats"
+
+    prompt_id = Column(Integer, ForeignKey("prompts.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Newspaper statistics, kept up to date as news is stored
+    total_articles = Column(Integer, nullable=False, default=0)
+    latest_refresh = Column(DateTime)  # Newest created_at among the prompt's news
+    categories_summary = Column(JSON)  # Article count per category name
+    feed_version = Column(Integer, nullable=False, default=0)  # Bumped whenever the feed is stored
+    updated_at = Column(DateTime)
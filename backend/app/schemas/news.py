@@ -1,6 +1,7 @@
 from pydantic import BaseModel, HttpUrl, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from enum import Enum
 
 class CategoryBase(BaseModel):
     name: str
@@ -71,4 +72,38 @@ class News(NewsBase):
 class NewsInPrompt(News):
     relevance_score: Optional[float] = Field(None, ge=0, le=1)
     display_order: Optional[int] = None
-    prompt_specific_meta: Optional[Dict[str, Any]] = None
\ No newline at end of file
+    prompt_specific_meta: Optional[Dict[str, Any]] = None
+
+class NewsSummary(BaseModel):
+    """Lightweight feed item without article bodies or raw upstream data"""
+    id: int
+    title: str
+    summary: Optional[str] = None
+    source: str
+    url: Optional[HttpUrl] = None
+    published_at: datetime
+    image_url: Optional[HttpUrl] = None
+    author: Optional[str] = None
+    read_time: Optional[int] = None
+    sentiment_score: Optional[float] = Field(None, ge=-1, le=1)
+    categories: List[Category] = []
+    relevance_score: Optional[float] = Field(None, ge=0, le=1)
+    display_order: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+class NewsView(str, Enum):
+    summary = "summary"
+    full = "full"
+
+class RefreshJob(BaseModel):
+    job_id: str
+    prompt_id: int
+    status: str
+    fetched: int = 0
+    processed: int = 0
+    failed: int = 0
+    stored: int = 0
+    skipped: int = 0
+    error: Optional[str] = None
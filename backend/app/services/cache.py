@@ -0,0 +1,321 @@
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import time
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from app.core.config import get_settings
+from app.core.llm.base import BaseLLM, LLMResponse
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_redis_client: Optional[redis.Redis] = None
+
+def get_redis() -> redis.Redis:
+    """
+    Returns the shared async Redis client
+    """
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT
+        )
+    return _redis_client
+
+async def close_redis() -> None:
+    """
+    Closes the shared Redis client and its connection pool
+    """
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.close()
+        _redis_client = None
+
+class LRUCache:
+    """
+    Small in-process LRU cache with per-entry expiry
+    """
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class TieredCache:
+    """
+    JSON value cache with an in-process LRU tier in front of Redis.
+    Redis errors are logged and treated as misses.
+    """
+    def __init__(self, namespace: str, ttl: int, memory_size: int = 256):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.memory = LRUCache(max_size=memory_size, ttl=ttl)
+        self.counters = {'memory_hits': 0, 'redis_hits': 0, 'misses': 0, 'errors': 0}
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _dump(self, value: Any) -> str:
+        return json.dumps(value, default=str)
+
+    def _load(self, raw: bytes) -> Any:
+        return json.loads(raw)
+
+    async def _store(self, client: redis.Redis, key: str, value: Any) -> None:
+        await client.set(self._key(key), self._dump(value), ex=self.ttl)
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.counters['memory_hits'] += 1
+            return value
+
+        try:
+            cached = await get_redis().get(self._key(key))
+        except RedisError as e:
+            logger.warning(f"{self.namespace} cache read failed: {e}")
+            self.counters['errors'] += 1
+            cached = None
+
+        if cached is None:
+            self.counters['misses'] += 1
+            return None
+
+        value = self._load(cached)
+        self.memory.set(key, value)
+        self.counters['redis_hits'] += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        try:
+            await self._store(get_redis(), key, value)
+        except RedisError as e:
+            logger.warning(f"{self.namespace} cache write failed: {e}")
+            self.counters['errors'] += 1
+
+    async def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        try:
+            await get_redis().delete(self._key(key))
+        except RedisError as e:
+            logger.warning(f"{self.namespace} cache delete failed: {e}")
+            self.counters['errors'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters['memory_hits'] + self.counters['redis_hits'] + self.counters['misses']
+        hits = lookups - self.counters['misses']
+        return {
+            **self.counters,
+            "memory_entries": len(self.memory),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+class LLMResponseCache(TieredCache):
+    """
+    Content-addressed cache of LLM completions.
+    Redis entries expire after the TTL and the oldest are evicted once the
+    configured entry limit is exceeded.
+    """
+    INDEX_KEY = "llm:response:index"
+
+    def __init__(
+        self,
+        ttl: int = None,
+        memory_size: int = None,
+        max_entries: int = None
+    ):
+        super().__init__(
+            namespace="llm:response",
+            ttl=ttl or settings.LLM_CACHE_TTL,
+            memory_size=settings.LLM_CACHE_MEMORY_SIZE if memory_size is None else memory_size
+        )
+        self.max_entries = max_entries or settings.LLM_CACHE_REDIS_MAX_ENTRIES
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: Optional[str],
+        system_prompt: Optional[str],
+        prompt: str,
+        content: str = "",
+        **params
+    ) -> str:
+        """
+        Hashes everything that determines a completion into a cache key
+        """
+        payload = json.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "system_prompt": system_prompt,
+                "prompt": prompt,
+                "content": content,
+                "params": params,
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _dump(self, value: LLMResponse) -> str:
+        return value.model_dump_json()
+
+    def _load(self, raw: bytes) -> LLMResponse:
+        return LLMResponse.model_validate_json(raw)
+
+    async def _store(self, client: redis.Redis, key: str, value: LLMResponse) -> None:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.set(self._key(key), self._dump(value), ex=self.ttl)
+            pipe.zadd(self.INDEX_KEY, {key: time.time()})
+            pipe.zcard(self.INDEX_KEY)
+            results = await pipe.execute()
+
+        overflow = results[-1] - self.max_entries
+        if overflow > 0:
+            await self._evict(client, overflow)
+
+    async def _evict(self, client: redis.Redis, count: int) -> None:
+        """
+        Drops the least recently written entries from Redis
+        """
+        evicted = await client.zpopmin(self.INDEX_KEY, count)
+        if evicted:
+            await client.delete(*[self._key(key.decode()) for key, _ in evicted])
+
+_llm_response_cache: Optional[LLMResponseCache] = None
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """
+    Returns the process-wide LLM response cache
+    """
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        _llm_response_cache = LLMResponseCache()
+    return _llm_response_cache
+
+class CachedLLM(BaseLLM):
+    """
+    Wraps an LLM adapter so identical requests are served from the cache
+    """
+    def __init__(self, llm: BaseLLM, provider: str, cache: LLMResponseCache = None):
+        self.llm = llm
+        self.provider = provider
+        self.cache = cache or get_llm_response_cache()
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self.llm, "model", None)
+
+    def _make_key(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        kwargs: Dict[str, Any]
+    ) -> str:
+        return self.cache.make_key(
+            provider=self.provider,
+            model=self.model,
+            system_prompt=system_prompt,
+            prompt=prompt,
+            content=kwargs.get("content", ""),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **{k: v for k, v in kwargs.items() if k != "content"}
+        )
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> LLMResponse:
+        key = self._make_key(prompt, system_prompt, temperature, max_tokens, kwargs)
+
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self.llm.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        await self.cache.set(key, response)
+        return response
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> AsyncIterator[LLMResponse]:
+        key = self._make_key(prompt, system_prompt, temperature, max_tokens, kwargs)
+
+        cached = await self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        # Stream through while assembling the full response for the cache
+        parts = []
+        metadata: Dict[str, Any] = {}
+        async for chunk in self.llm.generate_stream(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        ):
+            parts.append(chunk.content)
+            metadata.update(chunk.metadata)
+            yield chunk
+
+        await self.cache.set(key, LLMResponse(content="".join(parts), metadata=metadata))
+
+    async def health_check(self) -> bool:
+        return await self.llm.health_check()
+
+    async def close(self) -> None:
+        await self.llm.close()
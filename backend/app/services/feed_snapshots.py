@@ -0,0 +1,184 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from app.core.config import get_settings
+from app.models.news import News, NewsTransformation, news_prompts
+from app.models.prompt import PromptStats
+from app.schemas.news import NewsInPrompt
+from app.services.cache import get_redis
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bumped whenever the snapshot layout changes
+KEY_PREFIX = "feed:snapshot:2"
+
+def _key(prompt_id: int, version: int, suffix: str) -> str:
+    return f"{KEY_PREFIX}:{prompt_id}:v{version}:{suffix}"
+
+def _member(display_order: Optional[int], news_id: int) -> str:
+    # Every member has score 0, so the sorted set orders them by this key:
+    # zero-padded (display_order, news_id), with unordered items last
+    order = "~" * 12 if display_order is None else f"{display_order:012d}"
+    return f"{order}:{news_id:012d}"
+
+def _position(member: str) -> Tuple[Optional[int], int]:
+    order, news_id = member.split(":")
+    return (None if order.startswith("~") else int(order)), int(news_id)
+
+class FeedPage:
+    """
+    A page of serialized NewsInPrompt items read from a snapshot
+    """
+    def __init__(self, items: List[Dict[str, Any]], next_position: Optional[Tuple[Optional[int], int]]):
+        self.items = items
+        self.next_position = next_position
+
+def _load_snapshot(db: Session, prompt_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Loads and serializes the prompt's current feed for a snapshot
+    """
+    stats = db.get(PromptStats, prompt_id)
+    if stats is None:
+        return None
+
+    rows = db.execute(
+        select(
+            News,
+            news_prompts.c.display_order,
+            news_prompts.c.relevance_score,
+            news_prompts.c.meta_info
+        ).join(
+            news_prompts
+        ).options(
+            selectinload(News.categories),
+            selectinload(
+                News.transformations.and_(NewsTransformation.prompt_id == prompt_id)
+            )
+        ).where(
+            news_prompts.c.prompt_id == prompt_id
+        ).order_by(
+            news_prompts.c.display_order.asc().nulls_last(),
+            news_prompts.c.news_id
+        ).limit(settings.FEED_SNAPSHOT_SIZE + 1)
+    ).all()
+    complete = len(rows) <= settings.FEED_SNAPSHOT_SIZE
+    rows = rows[:settings.FEED_SNAPSHOT_SIZE]
+
+    members: List[str] = []
+    payloads: Dict[str, str] = {}
+    categories: Dict[str, List[str]] = {}
+    for row in rows:
+        news = row.News
+        news.display_order = row.display_order
+        news.relevance_score = row.relevance_score
+        news.prompt_specific_meta = row.meta_info
+
+        member = _member(row.display_order, news.id)
+        members.append(member)
+        payloads[member] = NewsInPrompt.model_validate(news).model_dump_json()
+        for category in news.categories:
+            categories.setdefault(category.slug, []).append(member)
+
+    return {
+        'version': stats.feed_version,
+        'members': members,
+        'payloads': payloads,
+        'categories': categories,
+        'complete': complete
+    }
+
+async def write_feed_snapshot(db: Session, prompt_id: int) -> None:
+    """
+    Serializes the prompt's current feed into Redis under its feed version.
+    Items are kept in sorted sets ordered by (display_order, news_id), one
+    for the feed and one per category, with a hash of NewsInPrompt
+    payloads. Failures are logged, not raised.
+    """
+    # The session is synchronous, so the queries run off the event loop
+    snapshot = await asyncio.to_thread(_load_snapshot, db, prompt_id)
+    if snapshot is None:
+        return
+    version = snapshot['version']
+    members = snapshot['members']
+
+    ttl = settings.FEED_SNAPSHOT_TTL
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            if members:
+                pipe.zadd(_key(prompt_id, version, "items"), dict.fromkeys(members, 0))
+                pipe.expire(_key(prompt_id, version, "items"), ttl)
+                pipe.hset(_key(prompt_id, version, "payloads"), mapping=snapshot['payloads'])
+                pipe.expire(_key(prompt_id, version, "payloads"), ttl)
+            for slug, category_members in snapshot['categories'].items():
+                pipe.zadd(_key(prompt_id, version, f"category:{slug}"), dict.fromkeys(category_members, 0))
+                pipe.expire(_key(prompt_id, version, f"category:{slug}"), ttl)
+            # Written last so readers never see a partial snapshot
+            pipe.set(
+                _key(prompt_id, version, "meta"),
+                json.dumps({"count": len(members), "complete": snapshot['complete']}),
+                ex=ttl
+            )
+            await pipe.execute()
+        logger.info(f"Wrote feed snapshot v{version} for prompt {prompt_id} ({len(members)} items)")
+    except RedisError as e:
+        logger.warning(f"Could not write feed snapshot for prompt {prompt_id}: {e}")
+
+async def read_feed_page(
+    prompt_id: int,
+    version: int,
+    skip: int,
+    limit: int,
+    position: Optional[Tuple[Optional[int], int]] = None,
+    category: Optional[str] = None
+) -> Optional[FeedPage]:
+    """
+    Reads a page of the prompt's feed from its snapshot, after position
+    when given and by offset otherwise. Returns None when the snapshot is
+    missing or doesn't cover the page, so the caller can use the database.
+    """
+    client = get_redis()
+    index_key = _key(prompt_id, version, f"category:{category}" if category else "items")
+
+    try:
+        meta = await client.get(_key(prompt_id, version, "meta"))
+        if meta is None:
+            return None
+        meta = json.loads(meta)
+
+        # One extra member tells whether there is a next page
+        if position is not None:
+            members = await client.zrangebylex(
+                index_key, f"({_member(*position)}", "+", start=0, num=limit + 1
+            )
+        else:
+            members = await client.zrange(index_key, skip, skip + limit)
+        members = [member.decode() for member in members]
+        if len(members) <= limit and not meta["complete"]:
+            # The page may continue past the end of a truncated snapshot
+            return None
+
+        page = members[:limit]
+        payloads = await client.hmget(
+            _key(prompt_id, version, "payloads"),
+            page
+        ) if page else []
+    except RedisError as e:
+        logger.warning(f"Could not read feed snapshot for prompt {prompt_id}: {e}")
+        return None
+
+    if any(payload is None for payload in payloads):
+        return None
+
+    next_position = None
+    if page and len(members) > limit:
+        next_position = _position(page[-1])
+
+    return FeedPage(
+        items=[json.loads(payload) for payload in payloads],
+        next_position=next_position
+    )
@@ -1,23 +1,77 @@
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, AsyncIterator, Set
 from datetime import datetime, timedelta
 import asyncio
+import json
 import logging
-from newsapi import NewsApiClient
+import re
 from app.models.news import News, Category, NewsTransformation, news_prompts
-from app.models.prompt import Prompt
+from app.models.prompt import Prompt, PromptCollectionState
+from app.core.llm.base import BaseLLM, LLMResponse
 from app.core.llm.factory import LLMFactory
 from app.core.config import get_settings
-from sqlalchemy import and_, or_, func
+from app.services.feed_snapshots import write_feed_snapshot
+from app.services.prompt_stats import record_feed_update
+from app.services.single_flight import SingleFlight
+from app.services.sources import NewsSourceFactory, merge_sources
+from sqlalchemy import and_, or_, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from pydantic import BaseModel, Field, ValidationError
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Per-provider limits are shared by every collector in the process so that
+# concurrent refreshes don't multiply the load on a single LLM backend
+_provider_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+def get_provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """
+    Returns the process-wide semaphore limiting calls to an LLM provider
+    """
+    if provider not in _provider_semaphores:
+        limit = settings.LLM_PROVIDER_CONCURRENCY.get(
+            provider,
+            settings.NEWS_PROCESSING_CONCURRENCY
+        )
+        _provider_semaphores[provider] = asyncio.Semaphore(max(1, limit))
+    return _provider_semaphores[provider]
+
+_refresh_flight = SingleFlight(
+    namespace="news:refresh",
+    lease_ttl=settings.REFRESH_LEASE_TTL,
+    wait_timeout=settings.REFRESH_WAIT_TIMEOUT
+)
+
+class StructuredNewsResult(BaseModel):
+    """
+    Expected shape of the single-call structured LLM response
+    """
+    transformed_content: str = Field(..., min_length=1)
+    relevance_score: float = Field(..., ge=0, le=1)
+    sentiment_score: float = Field(..., ge=-1, le=1)
+
 class NewsCollector:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        progress_callback: Optional[Callable[[Dict[str, int]], None]] = None
+    ):
         self.db = db
         self.llm_factory = LLMFactory()
-        self.newsapi = NewsApiClient(api_key=settings.NEWS_API_KEY)
+        self.stats = {'fetched': 0, 'processed': 0, 'failed': 0, 'stored': 0, 'skipped': 0}
+        self.progress_callback = progress_callback
+
+    def _report_progress(self):
+        """
+        Passes the current stats to the progress callback, if any
+        """
+        if self.progress_callback:
+            try:
+                self.progress_callback(dict(self.stats))
+            except Exception as e:
+                logger.warning(f"Error reporting collection progress: {e}")
 
     async def collect_news_for_prompt(self, prompt_id: int) -> List[News]:
         """
@@ -33,115 +87,235 @@ class NewsCollector:
             logger.info(f"Skipping refresh for prompt {prompt_id} - within refresh interval")
             return self._get_existing_news_for_prompt(prompt_id)
 
-        # Collect raw news based on prompt preferences
-        raw_news = await self._collect_raw_news(prompt)
+        # Concurrent refreshes of the same prompt share a single run
+        stored_news = None
+
+        async def refresh() -> Dict[str, int]:
+            nonlocal stored_news
+            stored_news = await self._refresh_prompt(prompt)
+            return dict(self.stats)
+
+        stats = await _refresh_flight.run(str(prompt_id), refresh)
+        if stored_news is not None:
+            return stored_news
+
+        if stats:
+            self.stats.update(stats)
+        return self._get_existing_news_for_prompt(prompt_id)
+
+    async def _refresh_prompt(self, prompt: Prompt) -> List[News]:
+        """
+        Runs the fetch, process and store pipeline for a prompt.
+        Only articles newer than the prompt's watermark are requested, and
+        articles the prompt already has a transformation for are skipped.
+        """
+        state = self.db.get(PromptCollectionState, prompt.id)
+        since = None
+        if state and state.last_published_at:
+            since = state.last_published_at - timedelta(seconds=settings.NEWS_WATERMARK_OVERLAP)
+        known_urls = self._get_transformed_urls(prompt.id, since)
+
+        # Collect raw news based on prompt preferences; articles are
+        # processed as they stream in rather than after the last page
+        raw_news = self._collect_raw_news(prompt, since, known_urls)
         
         # Process and organize news
         processed_news = await self._process_news_for_prompt(raw_news, prompt)
         
         # Store and organize in database
-        return await self._store_news_for_prompt(processed_news, prompt)
+        return await self._store_news_for_prompt(processed_news, prompt, state)
 
-    async def _collect_raw_news(self, prompt: Prompt) -> List[Dict[str, Any]]:
+    async def _collect_raw_news(
+        self,
+        prompt: Prompt,
+        since: Optional[datetime] = None,
+        known_urls: Optional[Set[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Collects raw news based on prompt preferences
+        Collects raw news from the prompt's sources (NEWS_SOURCES unless the
+        prompt picks its own), yielding each item as soon as it arrives.
+        Items published before since or already in known_urls are skipped.
         """
-        # Get preferences from prompt
+        known_urls = known_urls or set()
         preferences = prompt.source_preferences or {}
-        categories = prompt.custom_categories or {}
-        
-        # Default query parameters
-        query_params = {
-            'language': preferences.get('language', 'en'),
-            'sortBy': preferences.get('sort_by', 'relevancy'),
-            'pageSize': prompt.max_articles or 100,
-            'from': (datetime.utcnow() - timedelta(days=1)).isoformat()
-        }
-        
-        # Add category if specified
-        if categories.get('newsapi_category'):
-            query_params['category'] = categories['newsapi_category']
-        
-        # Add sources if specified
-        if preferences.get('sources'):
-            query_params['sources'] = ','.join(preferences['sources'])
-        
-        # Add search query if specified
-        if preferences.get('keywords'):
-            query_params['q'] = ' OR '.join(preferences['keywords'])
-        
-        try:
-            response = self.newsapi.get_everything(**query_params)
-            
-            # Transform to our standard format
-            news_items = []
-            for article in response['articles']:
-                news_items.append({
-                    'title': article['title'],
-                    'content': article['content'] or article['description'],
-                    'summary': article['description'],
-                    'source': article['source']['name'],
-                    'url': article['url'],
-                    'published_at': datetime.strptime(
-                        article['publishedAt'], 
-                        '%Y-%m-%dT%H:%M:%SZ'
-                    ),
-                    'image_url': article['urlToImage'],
-                    'author': article['author'],
-                    'raw_data': article
-                })
-            
-            return news_items
-            
-        except Exception as e:
-            logger.error(f"Error collecting news: {str(e)}")
-            return []
+
+        sources = []
+        for name in preferences.get('news_sources', settings.NEWS_SOURCES):
+            try:
+                sources.append(NewsSourceFactory.create(name))
+            except ValueError as e:
+                logger.warning(f"Skipping news source for prompt {prompt.id}: {e}")
+
+        def accept(news_item: Dict[str, Any]) -> bool:
+            published_at = news_item.get('published_at')
+            if news_item['url'] in known_urls or (since and published_at and published_at < since):
+                self.stats['skipped'] += 1
+                return False
+            return True
+
+        async for news_item in merge_sources(
+            sources, prompt, prompt.max_articles or 100, since=since, accept=accept
+        ):
+            yield news_item
 
     async def _process_news_for_prompt(
         self, 
-        raw_news: List[Dict[str, Any]], 
+        raw_news: AsyncIterator[Dict[str, Any]], 
         prompt: Prompt
     ) -> List[Dict[str, Any]]:
         """
-        Processes raw news using the prompt's LLM configuration
+        Processes raw news using the prompt's LLM configuration.
+        Articles are processed concurrently as they arrive, bounded by
+        NEWS_PROCESSING_CONCURRENCY and the provider's own limit.
         """
-        llm = self.llm_factory.create(provider=prompt.llm_provider)
-        processed_news = []
-
-        for news_item in raw_news:
-            try:
-                # Transform content using prompt
-                transformed = await llm.generate(
-                    prompt=prompt.prompt_text,
-                    system_prompt=prompt.system_prompt,
-                    content=news_item['content']
-                )
+        llm = self.llm_factory.create(
+            provider=prompt.llm_provider,
+            llm_config=prompt.llm_config
+        )
+        limit = asyncio.Semaphore(max(1, settings.NEWS_PROCESSING_CONCURRENCY))
 
-                # Calculate relevance score
-                relevance_score = await self._calculate_relevance_score(
-                    news_item, 
-                    transformed.content, 
-                    prompt
-                )
+        async def process(news_item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            async with limit:
+                try:
+                    result = await self._process_news_item(news_item, llm, prompt)
+                    self.stats['processed'] += 1
+                    return result
+                except Exception as e:
+                    logger.error(f"Error processing news item: {e}")
+                    self.stats['failed'] += 1
+                    return None
+                finally:
+                    self._report_progress()
 
-                # Process metadata
-                meta_info = await self._process_metadata(news_item, transformed, prompt)
+        tasks = []
+        async for news_item in raw_news:
+            tasks.append(asyncio.create_task(process(news_item)))
+            self.stats['fetched'] += 1
+        self._report_progress()
 
-                processed_news.append({
-                    'raw_data': news_item,
-                    'transformed_content': transformed.content,
-                    'relevance_score': relevance_score,
-                    'meta_info': meta_info
-                })
+        results = await asyncio.gather(*tasks)
+        processed_news = [result for result in results if result is not None]
 
-            except Exception as e:
-                logger.error(f"Error processing news item: {e}")
-                continue
+        logger.info(
+            f"Processed news for prompt {prompt.id}: "
+            f"{self.stats['processed']} succeeded, {self.stats['failed']} failed"
+        )
 
         # Sort by relevance score
         processed_news.sort(key=lambda x: x['relevance_score'], reverse=True)
         return processed_news
 
+    async def _process_news_item(
+        self,
+        news_item: Dict[str, Any],
+        llm: BaseLLM,
+        prompt: Prompt
+    ) -> Dict[str, Any]:
+        """
+        Transforms, scores and enriches a single news item
+        """
+        if self._use_structured_processing(prompt):
+            try:
+                return await self._process_news_item_structured(news_item, llm, prompt)
+            except (ValueError, ValidationError) as e:
+                logger.warning(
+                    f"Structured processing failed for {news_item.get('url')}, "
+                    f"falling back to separate calls: {e}"
+                )
+
+        # Transform content using prompt
+        transformed = await self._generate(
+            llm,
+            prompt,
+            prompt=prompt.prompt_text,
+            system_prompt=prompt.system_prompt,
+            content=news_item['content']
+        )
+
+        # Calculate relevance score
+        relevance_score = await self._calculate_relevance_score(
+            news_item, 
+            transformed.content, 
+            prompt
+        )
+
+        # Process metadata
+        meta_info = await self._process_metadata(news_item, transformed, prompt)
+
+        return {
+            'raw_data': news_item,
+            'transformed_content': transformed.content,
+            'relevance_score': relevance_score,
+            'meta_info': meta_info
+        }
+
+    def _use_structured_processing(self, prompt: Prompt) -> bool:
+        """
+        Whether to transform, score and classify sentiment in a single call.
+        A prompt can override the global setting through its llm_config.
+        """
+        llm_config = prompt.llm_config or {}
+        return llm_config.get('structured_processing', settings.NEWS_STRUCTURED_PROCESSING)
+
+    async def _process_news_item_structured(
+        self,
+        news_item: Dict[str, Any],
+        llm: BaseLLM,
+        prompt: Prompt
+    ) -> Dict[str, Any]:
+        """
+        Transforms, scores and classifies a news item with one LLM call.
+        Raises ValueError or ValidationError if the response can't be parsed.
+        """
+        keywords = (prompt.source_preferences or {}).get('keywords', [])
+        structured_prompt = f"""
+            {prompt.prompt_text}
+
+            Respond with only a JSON object with the following keys:
+            - "transformed_content": the article rewritten according to the instructions above
+            - "relevance_score": a number between 0 and 1 rating how relevant the article is,
+              considering timeliness, impact, relevance to topics: {keywords} and quality of information
+            - "sentiment_score": -1 for negative, 0 for neutral, 1 for positive
+            """
+
+        response = await self._generate(
+            llm,
+            prompt,
+            prompt=structured_prompt,
+            system_prompt=prompt.system_prompt,
+            content=f"{news_item['title']}\n\n{news_item['content']}"
+        )
+        result = self._parse_structured_response(response.content)
+
+        meta_info = self._build_meta_info(news_item, response, result.sentiment_score)
+        meta_info['structured'] = True
+
+        return {
+            'raw_data': news_item,
+            'transformed_content': result.transformed_content,
+            'relevance_score': result.relevance_score,
+            'meta_info': meta_info
+        }
+
+    def _parse_structured_response(self, content: str) -> StructuredNewsResult:
+        """
+        Extracts and validates the JSON object from a structured response,
+        tolerating surrounding text or markdown code fences
+        """
+        match = re.search(r'\{.*\}', content or '', re.DOTALL)
+        if not match:
+            raise ValueError("No JSON object in LLM response")
+        return StructuredNewsResult.model_validate(json.loads(match.group(0)))
+
+    async def _generate(self, llm: BaseLLM, prompt: Prompt, /, **kwargs) -> LLMResponse:
+        """
+        Calls the LLM while holding the provider's concurrency slot. The
+        prompt is positional-only since the LLM call takes a prompt too.
+        """
+        provider = prompt.llm_provider or settings.LLM_PROVIDER
+        async with get_provider_semaphore(provider):
+            return await llm.generate(**kwargs)
+
     async def _calculate_relevance_score(
         self, 
         news_item: Dict[str, Any], 
@@ -153,7 +327,10 @@ class NewsCollector:
         """
         try:
             # Use LLM to calculate relevance
-            llm = self.llm_factory.create(provider=prompt.llm_provider)
+            llm = self.llm_factory.create(
+                provider=prompt.llm_provider,
+                llm_config=prompt.llm_config
+            )
             
             relevance_prompt = f"""
             On a scale of 0 to 1, how relevant is this news article to the following criteria?
@@ -169,7 +346,7 @@ class NewsCollector:
             Return only the number between 0 and 1.
             """
             
-            response = await llm.generate(prompt=relevance_prompt)
+            response = await self._generate(llm, prompt, prompt=relevance_prompt)
             try:
                 score = float(response.content.strip())
                 return max(0.0, min(1.0, score))  # Ensure between 0 and 1
@@ -190,10 +367,6 @@ class NewsCollector:
         Processes and enriches news metadata
         """
         try:
-            # Extract reading time
-            word_count = len(news_item['content'].split())
-            reading_time = round(word_count / 200)  # Assuming 200 words per minute
-            
             # Basic sentiment analysis (can be enhanced with NLP)
             sentiment_prompt = f"""
             Analyze the sentiment of this text. Return only a number:
@@ -204,105 +377,267 @@ class NewsCollector:
             Text: {news_item['title']} {news_item['content'][:200]}
             """
             
-            llm = self.llm_factory.create(provider=prompt.llm_provider)
-            sentiment_response = await llm.generate(prompt=sentiment_prompt)
+            llm = self.llm_factory.create(
+                provider=prompt.llm_provider,
+                llm_config=prompt.llm_config
+            )
+            sentiment_response = await self._generate(llm, prompt, prompt=sentiment_prompt)
             try:
                 sentiment_score = float(sentiment_response.content.strip())
             except ValueError:
                 sentiment_score = 0
                 
-            return {
-                "reading_time": reading_time,
-                "word_count": word_count,
-                "sentiment_score": sentiment_score,
-                "processed_at": datetime.utcnow().isoformat(),
-                "source_metadata": news_item['raw_data'].get('metadata', {}),
-                "llm_metadata": transformed.meta_info
-            }
+            return self._build_meta_info(news_item, transformed, sentiment_score)
             
         except Exception as e:
             logger.error(f"Error processing metadata: {e}")
             return {}
 
+    def _build_meta_info(
+        self,
+        news_item: Dict[str, Any],
+        transformed: LLMResponse,
+        sentiment_score: float
+    ) -> Dict[str, Any]:
+        """
+        Builds the meta_info stored alongside a processed news item
+        """
+        # Extract reading time
+        word_count = len(news_item['content'].split())
+        reading_time = round(word_count / 200)  # Assuming 200 words per minute
+
+        return {
+            "reading_time": reading_time,
+            "word_count": word_count,
+            "sentiment_score": sentiment_score,
+            "processed_at": datetime.utcnow().isoformat(),
+            "source_metadata": news_item['raw_data'].get('metadata', {}),
+            "llm_metadata": transformed.metadata
+        }
+
     async def _store_news_for_prompt(
         self, 
         processed_news: List[Dict[str, Any]], 
-        prompt: Prompt
+        prompt: Prompt,
+        state: Optional[PromptCollectionState] = None
     ) -> List[News]:
         """
-        Stores processed news in the database and associates with prompt
+        Stores processed news in the database and associates with prompt.
+        News rows are upserted on url in one statement, then the prompt
+        associations and transformations are inserted in batches, all in a
+        single transaction. New articles go to the top of the prompt's feed,
+        and the prompt's stats and collection watermark are updated in the
+        same transaction.
         """
-        stored_news = []
-        display_order = 1
-
+        # A statement can't upsert the same url twice; keep the most relevant copy
+        unique_news = {}
         for news_data in processed_news:
+            unique_news.setdefault(news_data['raw_data']['url'], news_data)
+        processed_news = list(unique_news.values())
+
+        now = datetime.utcnow()
+        if not processed_news:
             try:
-                # Create or update news entry
-                news_item = self._create_or_update_news(news_data)
-                
-                # Create transformation record
-                transformation = NewsTransformation(
-                    news_id=news_item.id,
-                    prompt_id=prompt.id,
-                    transformed_content=news_data['transformed_content'],
-                    llm_provider=prompt.llm_provider,
-                    meta_info=news_data['meta_info']
-                )
+                self._update_collection_state(prompt, state, processed_news, now)
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                logger.error(f"Error updating collection state for prompt {prompt.id}: {e}")
+                raise
+            self.stats['stored'] = 0
+            self._report_progress()
+            return []
 
-                # Associate with prompt
-                stmt = news_prompts.insert().values(
-                    news_id=news_item.id,
-                    prompt_id=prompt.id,
-                    relevance_score=news_data['relevance_score'],
-                    display_order=display_order,
-                    meta_info=news_data['meta_info']
+        try:
+            news_ids = self._upsert_news(processed_news, now)
+            linked_ids = {
+                news_id
+                for (news_id,) in self.db.execute(
+                    select(news_prompts.c.news_id).where(
+                        news_prompts.c.prompt_id == prompt.id,
+                        news_prompts.c.news_id.in_(list(news_ids.values()))
+                    )
                 )
+            }
 
-                self.db.execute(stmt)
-                self.db.add(transformation)
-                stored_news.append(news_item)
-                display_order += 1
+            # Make room at the top of the feed for the new batch
+            self.db.execute(
+                news_prompts.update()
+                .where(news_prompts.c.prompt_id == prompt.id)
+                .values(display_order=news_prompts.c.display_order + len(processed_news))
+            )
 
-            except Exception as e:
-                logger.error(f"Error storing news item: {e}")
-                continue
+            # Articles the prompt already has take their new position and score
+            stmt = self._insert(news_prompts)
+            self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[news_prompts.c.prompt_id, news_prompts.c.news_id],
+                    set_={
+                        'display_order': stmt.excluded.display_order,
+                        'relevance_score': stmt.excluded.relevance_score,
+                        'meta_info': stmt.excluded.meta_info
+                    }
+                ),
+                [
+                    {
+                        'news_id': news_ids[news_data['raw_data']['url']],
+                        'prompt_id': prompt.id,
+                        'relevance_score': news_data['relevance_score'],
+                        'display_order': display_order,
+                        'meta_info': news_data['meta_info']
+                    }
+                    for display_order, news_data in enumerate(processed_news, start=1)
+                ]
+            )
+
+            self.db.execute(
+                insert(NewsTransformation),
+                [
+                    {
+                        'news_id': news_ids[news_data['raw_data']['url']],
+                        'prompt_id': prompt.id,
+                        'transformed_content': news_data['transformed_content'],
+                        'llm_provider': prompt.llm_provider,
+                        'meta_info': news_data['meta_info'],
+                        'created_at': now,
+                        'updated_at': now
+                    }
+                    for news_data in processed_news
+                ]
+            )
+
+            record_feed_update(
+                self.db,
+                prompt.id,
+                [news_id for news_id in set(news_ids.values()) if news_id not in linked_ids]
+            )
+            self._update_collection_state(prompt, state, processed_news, now)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error storing news for prompt {prompt.id}: {e}")
+            raise
+
+        # Readers are served from the snapshot until the next store
+        try:
+            await write_feed_snapshot(self.db, prompt.id)
+        except Exception as e:
+            logger.warning(f"Error writing feed snapshot for prompt {prompt.id}: {e}")
 
-        self.db.commit()
+        ordered_ids = [news_ids[news_data['raw_data']['url']] for news_data in processed_news]
+        news_by_id = {
+            news.id: news
+            for news in self.db.query(News).filter(News.id.in_(ordered_ids)).all()
+        }
+        stored_news = [news_by_id[news_id] for news_id in ordered_ids if news_id in news_by_id]
+
+        self.stats['stored'] = len(stored_news)
+        self._report_progress()
         return stored_news
 
-    def _create_or_update_news(self, news_data: Dict[str, Any]) -> News:
-        """
-        Creates or updates a news entry in the database
-        """
-        raw_data = news_data['raw_data']
-        existing_news = self.db.query(News).filter(
-            News.url == raw_data['url']
-        ).first()
-
-        if existing_news:
-            return existing_news
-
-        news_item = News(
-            title=raw_data['title'],
-            content=raw_data['content'],
-            summary=raw_data.get('summary'),
-            source=raw_data['source'],
-            url=raw_data['url'],
-            published_at=raw_data['published_at'],
-            image_url=raw_data.get('image_url'),
-            author=raw_data.get('author'),
-            raw_data=raw_data,
-            meta_info=news_data['meta_info']
+    def _upsert_news(self, processed_news: List[Dict[str, Any]], now: datetime) -> Dict[str, int]:
+        """
+        Inserts news rows, keeping existing rows with the same url untouched,
+        and returns the id for every url
+        """
+        stmt = self._insert(News).values([
+            {
+                'title': news_data['raw_data']['title'],
+                'content': news_data['raw_data']['content'],
+                'summary': news_data['raw_data'].get('summary'),
+                'source': news_data['raw_data']['source'],
+                'url': news_data['raw_data']['url'],
+                'published_at': news_data['raw_data']['published_at'],
+                'image_url': news_data['raw_data'].get('image_url'),
+                'author': news_data['raw_data'].get('author'),
+                'raw_data': self._json_safe(news_data['raw_data']),
+                'meta_info': news_data['meta_info'],
+                'created_at': now,
+                'updated_at': now
+            }
+            for news_data in processed_news
+        ])
+        # A no-op update (rather than DO NOTHING) makes RETURNING include existing rows
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[News.url],
+            set_={'url': stmt.excluded.url}
+        ).returning(News.id, News.url)
+
+        return {url: news_id for news_id, url in self.db.execute(stmt).all()}
+
+    def _update_collection_state(
+        self,
+        prompt: Prompt,
+        state: Optional[PromptCollectionState],
+        processed_news: List[Dict[str, Any]],
+        now: datetime
+    ) -> None:
+        """
+        Advances the prompt's watermark to the newest stored article and
+        records when the refresh finished
+        """
+        published = [
+            news_data['raw_data']['published_at']
+            for news_data in processed_news
+            if news_data['raw_data'].get('published_at')
+        ]
+        if state and state.last_published_at:
+            published.append(state.last_published_at)
+
+        stmt = self._insert(PromptCollectionState).values(
+            prompt_id=prompt.id,
+            last_published_at=max(published) if published else None,
+            last_collected_at=now
+        )
+        self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[PromptCollectionState.prompt_id],
+                set_={
+                    'last_published_at': stmt.excluded.last_published_at,
+                    'last_collected_at': stmt.excluded.last_collected_at
+                }
+            )
         )
 
-        self.db.add(news_item)
-        self.db.flush()  # Get ID without committing
-        return news_item
+    def _get_transformed_urls(self, prompt_id: int, since: Optional[datetime] = None) -> Set[str]:
+        """
+        Returns the urls of articles already transformed for the prompt,
+        limited to those published after since when it is given
+        """
+        query = self.db.query(News.url).join(
+            NewsTransformation,
+            NewsTransformation.news_id == News.id
+        ).filter(
+            NewsTransformation.prompt_id == prompt_id
+        )
+        if since:
+            query = query.filter(News.published_at >= since)
+        return {url for (url,) in query.distinct()}
+
+    def _insert(self, table: Any):
+        """
+        Returns a dialect-specific INSERT supporting ON CONFLICT
+        """
+        if self.db.get_bind().dialect.name == 'sqlite':
+            return sqlite_insert(table)
+        return pg_insert(table)
+
+    @staticmethod
+    def _json_safe(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converts values such as datetimes so the dict can be stored as JSON
+        """
+        return json.loads(json.dumps(data, default=str))
 
     def _get_last_refresh_time(self, prompt_id: int) -> Optional[datetime]:
         """
         Gets the last refresh time for a prompt
         """
+        state = self.db.get(PromptCollectionState, prompt_id)
+        if state and state.last_collected_at:
+            return state.last_collected_at
+
+        # Prompts refreshed before collection state was tracked
         result = self.db.query(func.max(News.created_at)).join(
             news_prompts
         ).filter(
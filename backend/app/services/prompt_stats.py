@@ -0,0 +1,181 @@
+from typing import Any, Dict, Iterable, List, Optional
+from datetime import datetime
+import argparse
+import logging
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.models.news import News, Category, news_categories, news_prompts
+from app.models.prompt import PromptStats
+
+logger = logging.getLogger(__name__)
+
+def _insert(db: Session, table: Any):
+    """
+    Returns a dialect-specific INSERT supporting ON CONFLICT
+    """
+    if db.get_bind().dialect.name == 'sqlite':
+        return sqlite_insert(table)
+    return pg_insert(table)
+
+def _category_counts(db: Session, news_ids: Iterable[int]) -> Dict[str, int]:
+    """
+    Counts the given news items per category name
+    """
+    rows = db.execute(
+        select(
+            Category.name,
+            func.count(news_categories.c.news_id).label('article_count')
+        ).join(
+            news_categories, news_categories.c.category_id == Category.id
+        ).where(
+            news_categories.c.news_id.in_(list(news_ids))
+        ).group_by(
+            Category.name
+        )
+    ).all()
+    return {row.name: row.article_count for row in rows}
+
+def record_feed_update(db: Session, prompt_id: int, news_ids: List[int]) -> None:
+    """
+    Adds newly associated news to a prompt's stats and bumps its feed
+    version. Must run in the same transaction that stored the feed; the
+    caller commits.
+    """
+    # Concurrent first stores would both find no row to lock, so the row
+    # is created first; a losing insert waits for the winner and skips
+    created = db.execute(
+        _insert(db, PromptStats).values(
+            prompt_id=prompt_id,
+            total_articles=0,
+            categories_summary={},
+            feed_version=0,
+            updated_at=datetime.utcnow()
+        ).on_conflict_do_nothing(index_elements=['prompt_id'])
+    ).rowcount
+    stats = db.get(PromptStats, prompt_id, with_for_update=True, populate_existing=True)
+    if created:
+        # No stats yet (or they were never built), so count everything
+        rebuild_prompt_stats(db, [prompt_id], commit=False)
+        return
+
+    stats.feed_version = (stats.feed_version or 0) + 1
+    stats.updated_at = datetime.utcnow()
+    if not news_ids:
+        return
+
+    latest = db.scalar(select(func.max(News.created_at)).where(News.id.in_(news_ids)))
+    summary = dict(stats.categories_summary or {})
+    for name, count in _category_counts(db, news_ids).items():
+        summary[name] = summary.get(name, 0) + count
+
+    stats.total_articles = (stats.total_articles or 0) + len(news_ids)
+    if latest and (stats.latest_refresh is None or latest > stats.latest_refresh):
+        stats.latest_refresh = latest
+    stats.categories_summary = summary
+
+def rebuild_prompt_stats(
+    db: Session,
+    prompt_ids: Optional[List[int]] = None,
+    commit: bool = True
+) -> int:
+    """
+    Recomputes stats from the news associations for the given prompts, or
+    for every prompt when none are given. Rows are updated in place, so
+    prompts without news keep their row with zeroed counts and feed
+    versions keep increasing. Returns the number of rows written.
+    """
+    totals_query = select(
+        news_prompts.c.prompt_id,
+        func.count(news_prompts.c.news_id).label('article_count'),
+        func.max(News.created_at).label('latest_refresh')
+    ).join(
+        News, News.id == news_prompts.c.news_id
+    ).group_by(
+        news_prompts.c.prompt_id
+    )
+    categories_query = select(
+        news_prompts.c.prompt_id,
+        Category.name,
+        func.count(news_categories.c.news_id).label('article_count')
+    ).join(
+        news_categories, news_categories.c.news_id == news_prompts.c.news_id
+    ).join(
+        Category, Category.id == news_categories.c.category_id
+    ).group_by(
+        news_prompts.c.prompt_id, Category.name
+    )
+    existing_query = select(PromptStats.prompt_id)
+
+    if prompt_ids is not None:
+        totals_query = totals_query.where(news_prompts.c.prompt_id.in_(prompt_ids))
+        categories_query = categories_query.where(news_prompts.c.prompt_id.in_(prompt_ids))
+        existing_query = existing_query.where(PromptStats.prompt_id.in_(prompt_ids))
+
+    summaries: Dict[int, Dict[str, int]] = {}
+    for row in db.execute(categories_query).all():
+        summaries.setdefault(row.prompt_id, {})[row.name] = row.article_count
+
+    now = datetime.utcnow()
+    rows = {
+        prompt_id: {
+            'prompt_id': prompt_id,
+            'total_articles': 0,
+            'latest_refresh': None,
+            'categories_summary': {},
+            'feed_version': 1,
+            'updated_at': now
+        }
+        for prompt_id in db.scalars(existing_query).all()
+    }
+    for row in db.execute(totals_query).all():
+        rows[row.prompt_id] = {
+            'prompt_id': row.prompt_id,
+            'total_articles': row.article_count,
+            'latest_refresh': row.latest_refresh,
+            'categories_summary': summaries.get(row.prompt_id, {}),
+            'feed_version': 1,
+            'updated_at': now
+        }
+
+    if rows:
+        stmt = _insert(db, PromptStats)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['prompt_id'],
+            set_={
+                'total_articles': stmt.excluded.total_articles,
+                'latest_refresh': stmt.excluded.latest_refresh,
+                'categories_summary': stmt.excluded.categories_summary,
+                'feed_version': PromptStats.feed_version + 1,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        db.execute(stmt, list(rows.values()))
+
+    # Rows loaded into the session would otherwise keep stale values
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, PromptStats) and obj.prompt_id in rows:
+            db.expire(obj)
+    if commit:
+        db.commit()
+
+    logger.info(f"Rebuilt stats for {len(rows)} prompts")
+    return len(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild per-prompt newspaper statistics")
+    parser.add_argument("prompt_ids", nargs="*", type=int, help="prompts to rebuild (default: all)")
+    args = parser.parse_args()
+
+    from app.db.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        written = rebuild_prompt_stats(db, args.prompt_ids or None)
+        print(f"Rebuilt stats for {written} prompts")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
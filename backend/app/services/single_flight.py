@@ -0,0 +1,135 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import json
+import logging
+import time
+import uuid
+from redis.exceptions import RedisError
+from app.services.cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Deletes the lease only if it is still held by the caller's token
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+class SingleFlight:
+    """
+    Ensures only one caller runs the work for a key at a time.
+    Within a process, late callers await the leader's future; across
+    processes a Redis lease elects the leader and the others wait for it
+    to be released, then read the result the leader published.
+    """
+    def __init__(
+        self,
+        namespace: str,
+        lease_ttl: int,
+        wait_timeout: int,
+        poll_interval: float = 0.5,
+        result_ttl: int = 60
+    ):
+        self.namespace = namespace
+        self.lease_ttl = lease_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.result_ttl = result_ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _lease_key(self, key: str) -> str:
+        return f"{self.namespace}:lease:{key}"
+
+    def _result_key(self, key: str) -> str:
+        return f"{self.namespace}:result:{key}"
+
+    async def run(self, key: str, work: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs work() unless it is already in flight for key, in which case
+        the in-flight result is returned instead. Results must be JSON
+        serializable to be shared across processes.
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            logger.info(f"Joining in-flight {self.namespace} for {key}")
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._run_with_lease(key, work)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case no one else was waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _run_with_lease(self, key: str, work: Callable[[], Awaitable[Any]]) -> Any:
+        token = uuid.uuid4().hex
+        client = get_redis()
+
+        try:
+            acquired = await client.set(self._lease_key(key), token, nx=True, ex=self.lease_ttl)
+        except RedisError as e:
+            logger.warning(f"Could not acquire {self.namespace} lease for {key}: {e}")
+            return await work()
+
+        if not acquired:
+            logger.info(f"Waiting for {self.namespace} of {key} held by another worker")
+            return await self._wait_for_remote(key)
+
+        heartbeat = asyncio.create_task(self._extend_lease(key, token))
+        try:
+            result = await work()
+            try:
+                await client.set(self._result_key(key), json.dumps(result, default=str), ex=self.result_ttl)
+            except (RedisError, TypeError) as e:
+                logger.warning(f"Could not publish {self.namespace} result for {key}: {e}")
+            return result
+        finally:
+            heartbeat.cancel()
+            try:
+                await client.eval(_RELEASE_SCRIPT, 1, self._lease_key(key), token)
+            except RedisError as e:
+                logger.warning(f"Could not release {self.namespace} lease for {key}: {e}")
+
+    async def _extend_lease(self, key: str, token: str) -> None:
+        """
+        Keeps the lease alive while long-running work is in progress
+        """
+        client = get_redis()
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            try:
+                if await client.get(self._lease_key(key)) != token.encode():
+                    return
+                await client.expire(self._lease_key(key), self.lease_ttl)
+            except RedisError as e:
+                logger.warning(f"Could not extend {self.namespace} lease for {key}: {e}")
+
+    async def _wait_for_remote(self, key: str) -> Optional[Any]:
+        """
+        Waits for another worker's lease to be released and returns the
+        result it published, if any
+        """
+        client = get_redis()
+        deadline = time.monotonic() + self.wait_timeout
+
+        while time.monotonic() < deadline:
+            try:
+                if not await client.exists(self._lease_key(key)):
+                    cached = await client.get(self._result_key(key))
+                    return json.loads(cached) if cached else None
+            except RedisError as e:
+                logger.warning(f"Error waiting for {self.namespace} of {key}: {e}")
+                return None
+            await asyncio.sleep(self.poll_interval)
+
+        logger.warning(f"Timed out waiting for {self.namespace} of {key}")
+        return None
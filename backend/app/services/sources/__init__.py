@@ -0,0 +1,20 @@
+from app.core.config import get_settings
+from app.services.sources.base import NewsSource, NewsSourceFactory, merge_sources
+from app.services.sources.newsapi import NewsAPISource
+from app.services.sources.rss import RSSSource
+
+settings = get_settings()
+
+NewsSourceFactory.register_source("newsapi", NewsAPISource)
+
+# Every configured feed group (e.g. "reuters") is available as a source
+for feed_name in settings.RSS_FEEDS:
+    NewsSourceFactory.register_source(feed_name, RSSSource)
+
+__all__ = [
+    "NewsSource",
+    "NewsSourceFactory",
+    "NewsAPISource",
+    "RSSSource",
+    "merge_sources"
+]
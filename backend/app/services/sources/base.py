@@ -0,0 +1,105 @@
+from abc import ABC, abstractmethod
+from contextlib import aclosing
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Type
+import asyncio
+import logging
+from app.models.prompt import Prompt
+
+logger = logging.getLogger(__name__)
+
+class NewsSource(ABC):
+    """
+    A provider of raw news. Implementations yield items in the collector's
+    standard shape: title, content, summary, source, url, published_at
+    (datetime), image_url, author and raw_data (JSON-serializable).
+    """
+    def __init__(self, name: str):
+        self.name = name
+
+    @abstractmethod
+    def iter_articles(
+        self,
+        prompt: Prompt,
+        max_articles: int,
+        since: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield up to max_articles normalized news items for the prompt,
+        limited to items published after since when it is given
+        """
+        pass
+
+class NewsSourceFactory:
+    _sources: Dict[str, Type[NewsSource]] = {}
+
+    @classmethod
+    def register_source(cls, name: str, source: Type[NewsSource]):
+        """Register a news source under a name"""
+        cls._sources[name] = source
+
+    @classmethod
+    def create(cls, name: str) -> NewsSource:
+        """Create the news source registered under name"""
+        if name not in cls._sources:
+            raise ValueError(f"Unsupported news source: {name}")
+        return cls._sources[name](name=name)
+
+_DONE = object()
+
+# Items buffered ahead of the consumer; sources wait while it is full
+_QUEUE_SIZE = 32
+
+async def merge_sources(
+    sources: List[NewsSource],
+    prompt: Prompt,
+    max_articles: int,
+    since: Optional[datetime] = None,
+    accept: Optional[Callable[[Dict[str, Any]], bool]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Polls all sources concurrently and yields up to max_articles items in
+    arrival order. Items rejected by accept don't count towards the limit.
+    A failing source is logged and doesn't stop the others. Once enough
+    items are yielded sources stop between items rather than mid-fetch.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+    stop = asyncio.Event()
+
+    async def pump(source: NewsSource):
+        try:
+            async with aclosing(source.iter_articles(prompt, max_articles, since=since)) as articles:
+                async for item in articles:
+                    await queue.put(item)
+                    if stop.is_set():
+                        break
+        except Exception as e:
+            logger.error(f"Error collecting news from {source.name} for prompt {prompt.id}: {e}")
+        # Not in a finally: a cancelled pump has no consumer left to take it,
+        # and waiting on a full queue would never return
+        await queue.put(_DONE)
+
+    tasks = [asyncio.create_task(pump(source)) for source in sources]
+    remaining = len(tasks)
+    yielded = 0
+    try:
+        while remaining and yielded < max_articles:
+            item = await queue.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            if accept is not None and not accept(item):
+                continue
+            yield item
+            yielded += 1
+
+        # Drain until every source has stopped at an item boundary
+        stop.set()
+        while remaining:
+            if await queue.get() is _DONE:
+                remaining -= 1
+    finally:
+        # Only reached with sources still running if the consumer went away
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
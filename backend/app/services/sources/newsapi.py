@@ -0,0 +1,304 @@
+from typing import Any, AsyncIterator, Dict, Optional
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+import time
+import httpx
+from redis.exceptions import RedisError
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+from app.core.config import get_settings
+from app.models.prompt import Prompt
+from app.services.cache import TieredCache, get_redis
+from app.services.sources.base import NewsSource
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# NewsAPI never returns more than this many articles per page
+MAX_PAGE_SIZE = 100
+
+# Raw NewsAPI results shared by prompts issuing the same query
+_fetch_cache = TieredCache(
+    namespace="news:fetch",
+    ttl=settings.NEWS_FETCH_CACHE_TTL,
+    memory_size=128
+)
+
+class NewsAPIError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None, code: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+class RetryableNewsAPIError(NewsAPIError):
+    """Rate limiting or a server-side failure worth retrying"""
+
+class RateBudgetExceeded(NewsAPIError):
+    """The API key has used up its request budget for the current window"""
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the pooled keep-alive HTTP client used for NewsAPI requests
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=settings.NEWS_API_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.NEWS_API_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.NEWS_API_MAX_CONNECTIONS
+            )
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+class RateBudget:
+    """
+    Fixed-window request budget for an API key, shared by every worker
+    through Redis. If Redis is unavailable requests are let through.
+    """
+    def __init__(self, api_key: str, limit: int, window: int):
+        # Only a digest of the key ends up in Redis
+        self.key_id = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        self.limit = limit
+        self.window = window
+
+    async def acquire(self) -> None:
+        window_start = int(time.time() // self.window)
+        key = f"newsapi:budget:{self.key_id}:{window_start}"
+
+        try:
+            client = get_redis()
+            used = await client.incr(key)
+            if used == 1:
+                await client.expire(key, self.window)
+        except RedisError as e:
+            logger.warning(f"Could not check NewsAPI rate budget: {e}")
+            return
+
+        if used > self.limit:
+            raise RateBudgetExceeded(
+                f"NewsAPI budget of {self.limit} requests per {self.window}s exhausted"
+            )
+
+class NewsAPIFetcher:
+    """
+    Async NewsAPI /everything client that pages through results and yields
+    articles as each page arrives
+    """
+    def __init__(self, api_key: str = None):
+        self.api_key = api_key or settings.NEWS_API_KEY
+        self.budget = RateBudget(
+            self.api_key,
+            limit=settings.NEWS_API_RATE_LIMIT,
+            window=settings.NEWS_API_RATE_WINDOW
+        )
+
+    async def iter_articles(
+        self,
+        query_params: Dict[str, Any],
+        max_articles: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields up to max_articles upstream articles for the query
+        """
+        page_size = min(MAX_PAGE_SIZE, max_articles)
+        page = 1
+        yielded = 0
+
+        while yielded < max_articles:
+            try:
+                data = await self._get_page(query_params, page, page_size)
+            except NewsAPIError as e:
+                # Plans with a result cap report it as an error on the next page
+                if e.code == "maximumResultsReached" and yielded:
+                    return
+                raise
+
+            articles = data.get("articles", [])
+            for article in articles:
+                yield article
+                yielded += 1
+                if yielded >= max_articles:
+                    return
+
+            if len(articles) < page_size or page * page_size >= data.get("totalResults", 0):
+                return
+            page += 1
+
+    async def _get_page(self, query_params: Dict[str, Any], page: int, page_size: int) -> Dict[str, Any]:
+        params = {**query_params, "page": page, "pageSize": page_size}
+
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception_type((RetryableNewsAPIError, httpx.TransportError)),
+            wait=wait_random_exponential(multiplier=1, max=30),
+            stop=stop_after_attempt(settings.NEWS_API_MAX_RETRIES),
+            reraise=True
+        ):
+            with attempt:
+                await self.budget.acquire()
+                response = await get_http_client().get(
+                    settings.NEWS_API_URL,
+                    params=params,
+                    headers={"X-Api-Key": self.api_key}
+                )
+                return self._parse_response(response)
+
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> Dict[str, Any]:
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+
+        if response.status_code == 200 and data.get("status") == "ok":
+            return data
+
+        message = data.get("message") or f"NewsAPI returned HTTP {response.status_code}"
+        error_class = (
+            RetryableNewsAPIError
+            if response.status_code == 429 or response.status_code >= 500
+            else NewsAPIError
+        )
+        raise error_class(message, status_code=response.status_code, code=data.get("code"))
+
+class NewsAPISource(NewsSource):
+    """
+    News source backed by the NewsAPI /everything endpoint
+    """
+    def __init__(self, name: str = "newsapi"):
+        super().__init__(name)
+        self.fetcher = NewsAPIFetcher()
+
+    async def iter_articles(
+        self,
+        prompt: Prompt,
+        max_articles: int,
+        since: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async for article in self._fetch_articles(self._build_query(prompt, since), max_articles):
+            try:
+                yield self._normalize_article(article)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping malformed article {article.get('url')}: {e}")
+
+    @staticmethod
+    def _build_query(prompt: Prompt, since: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Builds NewsAPI query params from the prompt's preferences. The
+        window starts at since when it is within the last day.
+        """
+        # Get preferences from prompt
+        preferences = prompt.source_preferences or {}
+        categories = prompt.custom_categories or {}
+        window_start = datetime.utcnow() - timedelta(days=1)
+        if since and since > window_start:
+            window_start = since
+        
+        # Default query parameters
+        query_params = {
+            'language': preferences.get('language', 'en'),
+            'sortBy': preferences.get('sort_by', 'relevancy'),
+            'from': window_start.replace(microsecond=0).isoformat()
+        }
+        
+        # Add category if specified
+        if categories.get('newsapi_category'):
+            query_params['category'] = categories['newsapi_category']
+        
+        # Add sources if specified (sorted so equivalent queries share a cache key)
+        if preferences.get('sources'):
+            query_params['sources'] = ','.join(sorted(preferences['sources']))
+        
+        # Add search query if specified
+        if preferences.get('keywords'):
+            query_params['q'] = ' OR '.join(sorted(preferences['keywords']))
+
+        return query_params
+
+    @staticmethod
+    def _normalize_article(article: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transforms an upstream NewsAPI article to our standard format
+        """
+        return {
+            'title': article['title'],
+            'content': article['content'] or article['description'],
+            'summary': article['description'],
+            'source': article['source']['name'],
+            'url': article['url'],
+            'published_at': datetime.strptime(
+                article['publishedAt'], 
+                '%Y-%m-%dT%H:%M:%SZ'
+            ),
+            'image_url': article['urlToImage'],
+            'author': article['author'],
+            'raw_data': article
+        }
+
+    async def _fetch_articles(
+        self,
+        query_params: Dict[str, Any],
+        max_articles: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams articles for a query, sharing results between prompts whose
+        queries only differ in a later window start or a smaller article
+        count. Only complete fetches are cached.
+        """
+        cache_key = self._fetch_cache_key(query_params)
+
+        cached = await _fetch_cache.get(cache_key)
+        if (
+            cached is not None
+            and cached['max_articles'] >= max_articles
+            and cached.get('from', '') <= query_params['from']
+        ):
+            logger.info(f"Serving NewsAPI query from cache ({cache_key[:12]})")
+            served = 0
+            for article in cached['articles']:
+                if (article.get('publishedAt') or '') < query_params['from']:
+                    continue
+                yield article
+                served += 1
+                if served >= max_articles:
+                    return
+            return
+
+        articles = []
+        async for article in self.fetcher.iter_articles(query_params, max_articles):
+            articles.append(article)
+            yield article
+
+        await _fetch_cache.set(cache_key, {
+            'from': query_params['from'],
+            'max_articles': max_articles,
+            'articles': articles
+        })
+
+    @staticmethod
+    def _fetch_cache_key(query_params: Dict[str, Any]) -> str:
+        """
+        Normalizes query params into a cache key; the window start is left
+        out since the TTL bounds staleness and it's checked on read
+        """
+        normalized = {
+            key: str(value).strip().lower()
+            for key, value in query_params.items()
+            if key != 'from'
+        }
+        payload = json.dumps(normalized, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
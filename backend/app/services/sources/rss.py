@@ -0,0 +1,196 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+from datetime import datetime
+import asyncio
+import hashlib
+import json
+import logging
+import feedparser
+import httpx
+from redis.exceptions import RedisError
+from app.core.config import get_settings
+from app.models.prompt import Prompt
+from app.services.cache import get_redis
+from app.services.sources.base import NewsSource
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the pooled keep-alive HTTP client used to poll feeds. Only
+    operator-configured feeds are polled and redirects aren't followed,
+    so a feed can't point the server at other hosts.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=settings.RSS_TIMEOUT,
+            follow_redirects=False,
+            limits=httpx.Limits(
+                max_connections=settings.RSS_CONCURRENCY,
+                max_keepalive_connections=settings.RSS_CONCURRENCY
+            )
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+class RSSSource(NewsSource):
+    """
+    Polls RSS/Atom feeds concurrently. Each feed's ETag/Last-Modified
+    validators are kept in Redis with its last parsed items, so a feed
+    that answers 304 Not Modified is served without downloading or
+    parsing it again.
+    """
+    STATE_PREFIX = "rss:feed:"
+
+    def _feed_urls(self, prompt: Prompt) -> List[str]:
+        return settings.RSS_FEEDS.get(self.name, [])
+
+    async def iter_articles(
+        self,
+        prompt: Prompt,
+        max_articles: int,
+        since: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        keywords = [
+            keyword.lower()
+            for keyword in (prompt.source_preferences or {}).get('keywords', [])
+        ]
+        limit = asyncio.Semaphore(max(1, settings.RSS_CONCURRENCY))
+
+        async def poll(url: str) -> List[Dict[str, Any]]:
+            async with limit:
+                return await self._poll_feed(url)
+
+        tasks = [asyncio.create_task(poll(url)) for url in self._feed_urls(prompt)]
+        yielded = 0
+        try:
+            for next_feed in asyncio.as_completed(tasks):
+                try:
+                    items = await next_feed
+                except Exception as e:
+                    logger.error(f"Error polling feed for {self.name}: {e}")
+                    continue
+
+                for item in items:
+                    if keywords and not self._matches(item, keywords):
+                        continue
+                    if since and item['published_at'] and item['published_at'] < since:
+                        continue
+                    yield item
+                    yielded += 1
+                    if yielded >= max_articles:
+                        return
+        finally:
+            # Polls still running once enough items were read, or when the
+            # caller stops early, aren't needed any more
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _matches(item: Dict[str, Any], keywords: List[str]) -> bool:
+        text = f"{item['title']} {item.get('summary') or ''}".lower()
+        return any(keyword in text for keyword in keywords)
+
+    async def _poll_feed(self, url: str) -> List[Dict[str, Any]]:
+        """
+        Fetches a feed with a conditional GET and returns its normalized items
+        """
+        state = await self._load_state(url)
+        headers = {}
+        if state:
+            if state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
+
+        response = await get_http_client().get(url, headers=headers)
+        if response.status_code == 304 and state:
+            logger.debug(f"Feed not modified: {url}")
+            return [self._deserialize_item(item) for item in state['items']]
+        response.raise_for_status()
+
+        # Parsing is CPU-bound, keep it off the event loop
+        parsed = await asyncio.to_thread(feedparser.parse, response.content)
+
+        items = []
+        for entry in parsed.entries:
+            try:
+                items.append(self._normalize_entry(entry, parsed.feed, url))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping malformed entry in {url}: {e}")
+
+        await self._save_state(url, {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'items': [self._serialize_item(item) for item in items]
+        })
+        return items
+
+    def _normalize_entry(self, entry: Dict[str, Any], feed: Dict[str, Any], feed_url: str) -> Dict[str, Any]:
+        """
+        Transforms a feedparser entry to the collector's standard format
+        """
+        published = entry.get('published_parsed') or entry.get('updated_parsed')
+        summary = entry.get('summary')
+        content = entry['content'][0]['value'] if entry.get('content') else summary
+
+        image_url = None
+        for media in entry.get('media_content', []) + entry.get('media_thumbnail', []):
+            if media.get('url'):
+                image_url = media['url']
+                break
+
+        return {
+            'title': entry['title'],
+            'content': content or entry['title'],
+            'summary': summary,
+            'source': feed.get('title') or self.name,
+            'url': entry['link'],
+            'published_at': datetime(*published[:6]) if published else datetime.utcnow(),
+            'image_url': image_url,
+            'author': entry.get('author'),
+            'raw_data': {
+                'id': entry.get('id'),
+                'title': entry['title'],
+                'link': entry['link'],
+                'summary': summary,
+                'published': entry.get('published') or entry.get('updated'),
+                'author': entry.get('author'),
+                'feed_url': feed_url,
+                'feed_title': feed.get('title')
+            }
+        }
+
+    @staticmethod
+    def _serialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {**item, 'published_at': item['published_at'].isoformat()}
+
+    @staticmethod
+    def _deserialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {**item, 'published_at': datetime.fromisoformat(item['published_at'])}
+
+    def _state_key(self, url: str) -> str:
+        return self.STATE_PREFIX + hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    async def _load_state(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            cached = await get_redis().get(self._state_key(url))
+        except RedisError as e:
+            logger.warning(f"Could not load feed state for {url}: {e}")
+            return None
+        return json.loads(cached) if cached else None
+
+    async def _save_state(self, url: str, state: Dict[str, Any]) -> None:
+        try:
+            await get_redis().set(self._state_key(url), json.dumps(state), ex=settings.RSS_STATE_TTL)
+        except RedisError as e:
+            logger.warning(f"Could not save feed state for {url}: {e}")
@@ -0,0 +1,83 @@
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+from celery.signals import worker_process_init, worker_process_shutdown
+from app.core.celery_app import celery_app
+from app.core.config import get_settings
+from app.core.llm.factory import LLMFactory
+from app.db.database import SessionLocal
+from app.services.cache import close_redis
+from app.services.news_collector import NewsCollector
+from app.services.sources import newsapi, rss
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Each worker process owns one event loop, so the pooled clients (Redis,
+# HTTP, LLM connections) and semaphores created by a task stay bound to
+# the loop later tasks run on. Workers must use the prefork (or solo)
+# pool, which runs one task per process at a time.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+@worker_process_init.connect
+def _init_worker_loop(**kwargs):
+    global _loop
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+
+@worker_process_shutdown.connect
+def _close_worker_loop(**kwargs):
+    global _loop
+    if _loop is None or _loop.is_closed():
+        return
+    try:
+        _loop.run_until_complete(_close_clients())
+    finally:
+        _loop.close()
+        _loop = None
+
+async def _close_clients() -> None:
+    await LLMFactory.shutdown()
+    await newsapi.close_http_client()
+    await rss.close_http_client()
+    await close_redis()
+
+def _run(coro):
+    global _loop
+    if _loop is None or _loop.is_closed():
+        # Solo pool or a direct call outside a worker process
+        _init_worker_loop()
+    return _loop.run_until_complete(coro)
+
+async def _refresh_prompt_news(
+    prompt_id: int,
+    progress_callback: Callable[[Dict[str, int]], None]
+) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        collector = NewsCollector(db, progress_callback=progress_callback)
+        await collector.collect_news_for_prompt(prompt_id)
+        return {"prompt_id": prompt_id, **collector.stats}
+    finally:
+        db.close()
+
+@celery_app.task(bind=True, name="news.refresh_prompt")
+def refresh_prompt_news(self, prompt_id: int) -> Dict[str, Any]:
+    """
+    Runs the fetch, LLM and store pipeline for a prompt in the background
+    """
+    last_report = 0.0
+
+    def report_progress(stats: Dict[str, int]):
+        # Called on the event loop for every article; the result backend
+        # write blocks, so only the latest stats are sent every interval
+        nonlocal last_report
+        now = time.monotonic()
+        if now - last_report < settings.REFRESH_PROGRESS_INTERVAL:
+            return
+        last_report = now
+        self.update_state(state="PROGRESS", meta={"prompt_id": prompt_id, **stats})
+
+    logger.info(f"Refreshing news for prompt {prompt_id} (job {self.request.id})")
+    return _run(_refresh_prompt_news(prompt_id, report_progress))
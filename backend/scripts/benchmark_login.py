@@ -0,0 +1,103 @@
+"""
+Login throughput benchmark.
+
+Fires bursts of concurrent logins at a running API while polling /health,
+and reports login throughput alongside health-check latency. With bcrypt
+on the event loop, health latency climbs with the burst size; with it
+offloaded it should stay flat.
+
+    python scripts/benchmark_login.py --email bench@example.com --password secret \\
+        --base-url http://localhost:8000 --concurrency 50 --requests 500
+"""
+from typing import List
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def _ensure_user(client: httpx.AsyncClient, api: str, email: str, password: str) -> None:
+    response = await client.post(f"{api}/users/", json={"email": email, "password": password})
+    if response.status_code not in (200, 400, 500):
+        response.raise_for_status()
+
+async def _login_worker(
+    client: httpx.AsyncClient,
+    api: str,
+    email: str,
+    password: str,
+    remaining: List[int],
+    latencies: List[float],
+    statuses: dict
+) -> None:
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        started = time.perf_counter()
+        response = await client.post(
+            f"{api}/auth/token",
+            data={"username": email, "password": password}
+        )
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+async def _health_probe(client: httpx.AsyncClient, base_url: str, stop: asyncio.Event, latencies: List[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get(f"{base_url}/health")
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.05)
+
+async def run(args: argparse.Namespace) -> None:
+    api = f"{args.base_url}{args.api_prefix}"
+    limits = httpx.Limits(max_connections=args.concurrency + 2)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        await _ensure_user(client, api, args.email, args.password)
+
+        login_latencies: List[float] = []
+        health_latencies: List[float] = []
+        statuses: dict = {}
+        remaining = [args.requests]
+        stop = asyncio.Event()
+
+        probe = asyncio.create_task(_health_probe(client, args.base_url, stop, health_latencies))
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            _login_worker(client, api, args.email, args.password, remaining, login_latencies, statuses)
+            for _ in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+
+    print(f"logins:        {len(login_latencies)} in {elapsed:.2f}s ({len(login_latencies) / elapsed:.1f}/s)")
+    print(f"status codes:  {dict(sorted(statuses.items()))}")
+    print(
+        f"login latency: p50 {_percentile(login_latencies, 50) * 1000:.0f}ms, "
+        f"p95 {_percentile(login_latencies, 95) * 1000:.0f}ms, "
+        f"max {max(login_latencies, default=0) * 1000:.0f}ms"
+    )
+    print(
+        f"health during burst: p50 {_percentile(health_latencies, 50) * 1000:.1f}ms, "
+        f"p95 {_percentile(health_latencies, 95) * 1000:.1f}ms, "
+        f"mean {statistics.fmean(health_latencies) * 1000 if health_latencies else 0:.1f}ms"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login throughput and event-loop responsiveness")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--email", default="bench@example.com")
+    parser.add_argument("--password", default="benchmark-password")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import os
+
+# Settings are read at import time, so defaults must be in place first
+os.environ.setdefault("POSTGRES_SERVER", "localhost")
+os.environ.setdefault("POSTGRES_USER", "test")
+os.environ.setdefault("POSTGRES_PASSWORD", "test")
+os.environ.setdefault("POSTGRES_DB", "test")
+os.environ.setdefault("REDIS_HOST", "localhost")
+os.environ.setdefault("REDIS_PORT", "6379")
+os.environ.setdefault("NEWS_API_KEY", "test")
+os.environ.setdefault("SECRET_KEY", "test")
+
+import fakeredis
+import fakeredis.aioredis
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.models.base import Base
+from app.services import cache
+
+@pytest_asyncio.fixture
+async def fake_redis(monkeypatch):
+    """
+    Replaces the shared Redis client with an in-memory one
+    """
+    client = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer())
+    monkeypatch.setattr(cache, "_redis_client", client)
+    yield client
+    await client.aclose()
+
+@pytest_asyncio.fixture
+async def db():
+    """
+    An async session on a fresh in-memory SQLite database
+    """
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
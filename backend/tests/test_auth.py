@@ -0,0 +1,31 @@
+import pytest
+from app.core import auth
+from app.core.auth import create_access_token, get_current_user
+from app.models.user import User
+
+@pytest.mark.asyncio
+async def test_cached_user_is_not_shared_between_emails_differing_in_case(db, fake_redis):
+    alice = User(email="alice@example.com", hashed_password="x", is_active=True)
+    other = User(email="Alice@example.com", hashed_password="x", is_active=True)
+    db.add_all([alice, other])
+    await db.commit()
+
+    # The first token populates the cache
+    first = await get_current_user(create_access_token({"sub": alice.email}), db)
+    second = await get_current_user(create_access_token({"sub": other.email}), db)
+
+    assert first.id == alice.id
+    assert second.id == other.id
+
+@pytest.mark.asyncio
+async def test_cached_user_with_another_email_is_ignored(db, fake_redis):
+    alice = User(email="alice@example.com", hashed_password="x", is_active=True)
+    db.add(alice)
+    await db.commit()
+    await auth._user_cache.set(
+        auth._user_cache_key(alice.email),
+        {"id": 99, "email": "mallory@example.com", "is_active": True}
+    )
+
+    user = await get_current_user(create_access_token({"sub": alice.email}), db)
+    assert user.id == alice.id
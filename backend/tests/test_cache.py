@@ -0,0 +1,35 @@
+import pytest
+from app.core.llm.base import LLMResponse
+from app.services.cache import LLMResponseCache, TieredCache
+
+@pytest.mark.asyncio
+async def test_tiered_cache_reads_through_to_redis(fake_redis):
+    writer = TieredCache(namespace="test", ttl=60)
+    reader = TieredCache(namespace="test", ttl=60)
+
+    await writer.set("key", {"value": 1})
+
+    assert await reader.get("key") == {"value": 1}
+    assert await reader.get("key") == {"value": 1}
+    assert await reader.get("missing") is None
+    assert reader.stats()["redis_hits"] == 1
+    assert reader.stats()["memory_hits"] == 1
+    assert reader.stats()["misses"] == 1
+
+@pytest.mark.asyncio
+async def test_llm_response_cache_round_trips_responses(fake_redis):
+    response = LLMResponse(content="Hello", metadata={"model": "test"})
+    await LLMResponseCache(memory_size=0).set("abc", response)
+
+    assert await LLMResponseCache(memory_size=0).get("abc") == response
+    assert await fake_redis.exists("llm:response:abc") == 1
+
+@pytest.mark.asyncio
+async def test_llm_response_cache_evicts_oldest_entries(fake_redis):
+    cache = LLMResponseCache(memory_size=0, max_entries=2)
+    for key in ["a", "b", "c"]:
+        await cache.set(key, LLMResponse(content=key))
+
+    assert await cache.get("a") is None
+    assert (await cache.get("c")).content == "c"
+    assert await fake_redis.zcard(LLMResponseCache.INDEX_KEY) == 2
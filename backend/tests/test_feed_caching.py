@@ -0,0 +1,97 @@
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.requests import Request
+from app.api.v1.endpoints import news as news_endpoints
+from app.core.auth import get_current_user
+from app.db.database import get_async_db
+from app.models.prompt import Prompt, PromptStats
+from app.models.user import User
+from app.schemas.user import User as UserSchema
+
+def _request(query_string: str = "", if_none_match: str = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/news/prompt/1",
+        "query_string": query_string.encode(),
+        "headers": headers
+    })
+
+def _stats(feed_version: int = 1) -> PromptStats:
+    return PromptStats(prompt_id=1, feed_version=feed_version, updated_at=datetime(2024, 1, 1))
+
+def _etag(request: Request, stats: PromptStats, is_public: bool = False) -> str:
+    prompt = Prompt(id=1, is_public=is_public)
+    return news_endpoints._feed_cache_headers(request, prompt, stats)["ETag"]
+
+def test_etag_changes_with_feed_version():
+    assert _etag(_request(), _stats(1)) != _etag(_request(), _stats(2))
+
+def test_etag_changes_with_query_params():
+    stats = _stats()
+    assert _etag(_request("limit=10"), stats) != _etag(_request("limit=20"), stats)
+    assert _etag(_request("view=summary"), stats) != _etag(_request("view=full"), stats)
+
+def test_etag_ignores_param_order_and_refresh():
+    stats = _stats()
+    assert _etag(_request("skip=0&limit=10"), stats) == _etag(_request("limit=10&skip=0"), stats)
+    assert _etag(_request("limit=10"), stats) == _etag(_request("limit=10&refresh=true"), stats)
+
+def test_cache_control_depends_on_visibility():
+    request = _request()
+    private = news_endpoints._feed_cache_headers(request, Prompt(id=1, is_public=False), _stats())
+    public = news_endpoints._feed_cache_headers(request, Prompt(id=1, is_public=True), _stats())
+    assert private["Cache-Control"] == "private, no-cache"
+    assert public["Cache-Control"].startswith("public, max-age=")
+
+@pytest.mark.parametrize("if_none_match, matches", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", "abc"', True),
+    ("*", True),
+    ('"other"', False),
+    (None, False),
+])
+def test_not_modified_matches_if_none_match(if_none_match, matches):
+    assert news_endpoints._not_modified(_request(if_none_match=if_none_match), '"abc"') is matches
+
+@pytest.mark.asyncio
+async def test_feed_returns_304_until_the_feed_version_changes(db, fake_redis):
+    user = User(email="reader@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    await db.flush()
+    prompt = Prompt(name="Feed", prompt_text="Summarize", user_id=user.id)
+    db.add(prompt)
+    await db.flush()
+    stats = PromptStats(prompt_id=prompt.id, feed_version=1, updated_at=datetime(2024, 1, 1))
+    db.add(stats)
+    await db.commit()
+    current_user = UserSchema.model_validate(user)
+
+    async def override_db():
+        yield db
+
+    app = FastAPI()
+    app.include_router(news_endpoints.router, prefix="/news")
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[get_current_user] = lambda: current_user
+
+    url = f"/news/prompt/{prompt.id}"
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        first = await client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        cached = await client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+        assert cached.content == b""
+
+        stats.feed_version = 2
+        await db.commit()
+        changed = await client.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
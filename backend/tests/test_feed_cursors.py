@@ -0,0 +1,86 @@
+from datetime import datetime
+import base64
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.endpoints.news import _decode_cursor, _encode_cursor, _feed_query, _fetch_feed_page
+from app.models.news import News, news_prompts
+from app.models.prompt import Prompt
+from app.models.user import User
+
+async def _seed_feed(db: AsyncSession, display_orders):
+    user = User(email="reader@example.com", hashed_password="x")
+    db.add(user)
+    await db.flush()
+    prompt = Prompt(name="Feed", prompt_text="Summarize", user_id=user.id)
+    db.add(prompt)
+    await db.flush()
+
+    for index, display_order in enumerate(display_orders):
+        news = News(
+            title=f"News {index}",
+            content="Body",
+            source="Test",
+            url=f"https://example.com/{index}",
+            published_at=datetime(2024, 1, 1)
+        )
+        db.add(news)
+        await db.flush()
+        await db.execute(insert(news_prompts).values(
+            news_id=news.id,
+            prompt_id=prompt.id,
+            display_order=display_order
+        ))
+    await db.commit()
+    return prompt
+
+def test_cursor_round_trip():
+    cursor = _encode_cursor(7, 1234)
+    assert "=" not in cursor
+    assert _decode_cursor(cursor) == (7, 1234)
+    assert _decode_cursor(_encode_cursor(None, 12)) == (None, 12)
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b"[1]").decode(),
+    base64.urlsafe_b64encode(b"[1, 2, 3]").decode(),
+    base64.urlsafe_b64encode(b'["a", 2]').decode(),
+    base64.urlsafe_b64encode(b"[1, null]").decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+@pytest.mark.asyncio
+async def _page_through(db: AsyncSession, prompt: Prompt, limit: int):
+    seen = []
+    cursor = None
+    while True:
+        response = Response()
+        page = await _fetch_feed_page(db, _feed_query(prompt.id), response, 0, limit, cursor)
+        seen.extend((news.display_order, news.id) for news in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return seen
+
+@pytest.mark.asyncio
+async def test_cursor_pages_break_ties_by_news_id(db):
+    # Equal display orders straddle the page boundaries
+    prompt = await _seed_feed(db, [0, 1, 1, 1, 1, 2])
+
+    seen = await _page_through(db, prompt, 2)
+
+    assert seen == sorted(seen)
+    assert [news_id for _, news_id in seen] == [1, 2, 3, 4, 5, 6]
+
+@pytest.mark.asyncio
+async def test_cursor_pages_reach_news_without_display_order(db):
+    prompt = await _seed_feed(db, [None, 1, 2, None])
+
+    seen = await _page_through(db, prompt, 1)
+
+    assert seen == [(1, 2), (2, 3), (None, 1), (None, 4)]
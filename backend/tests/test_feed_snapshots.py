@@ -0,0 +1,106 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.models.base import Base
+from app.models.news import News, news_prompts
+from app.models.prompt import Prompt, PromptStats
+from app.models.user import User
+from app.services.feed_snapshots import read_feed_page, write_feed_snapshot
+
+@pytest.fixture
+def sync_db():
+    # Snapshots load on a worker thread, so the in-memory database is shared
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+def _seed_feed(db: Session, display_orders) -> Prompt:
+    user = User(email="reader@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    prompt = Prompt(name="Feed", prompt_text="Summarize", user_id=user.id)
+    db.add(prompt)
+    db.flush()
+    db.add(PromptStats(prompt_id=prompt.id, feed_version=3, updated_at=datetime(2024, 1, 1)))
+
+    for index, display_order in enumerate(display_orders):
+        news = News(
+            title=f"News {index}",
+            content="Body",
+            source="Test",
+            url=f"https://example.com/{index}",
+            published_at=datetime(2024, 1, 1)
+        )
+        db.add(news)
+        db.flush()
+        db.execute(insert(news_prompts).values(
+            news_id=news.id,
+            prompt_id=prompt.id,
+            display_order=display_order
+        ))
+    db.commit()
+    return prompt
+
+@pytest.mark.asyncio
+async def test_snapshot_pages_follow_display_order_then_news_id(sync_db, fake_redis):
+    prompt = _seed_feed(sync_db, [2, 1, 1, 1, 10, 1])
+    await write_feed_snapshot(sync_db, prompt.id)
+
+    seen = []
+    position = None
+    while True:
+        page = await read_feed_page(prompt.id, 3, 0, 2, position=position)
+        seen.extend((item["display_order"], item["id"]) for item in page.items)
+        position = page.next_position
+        if position is None:
+            break
+
+    assert seen == [(1, 2), (1, 3), (1, 4), (1, 6), (2, 1), (10, 5)]
+
+@pytest.mark.asyncio
+async def test_snapshot_seeks_past_positions_missing_from_the_snapshot(sync_db, fake_redis):
+    prompt = _seed_feed(sync_db, [1, 1, 3, 3])
+    await write_feed_snapshot(sync_db, prompt.id)
+
+    # A cursor from an older version can point between snapshot items
+    page = await read_feed_page(prompt.id, 3, 0, 10, position=(2, 1))
+    assert [item["id"] for item in page.items] == [3, 4]
+
+    page = await read_feed_page(prompt.id, 3, 0, 10, position=(3, 3))
+    assert [item["id"] for item in page.items] == [4]
+
+@pytest.mark.asyncio
+async def test_items_without_display_order_sort_last(sync_db, fake_redis):
+    prompt = _seed_feed(sync_db, [None, 2, 1])
+    await write_feed_snapshot(sync_db, prompt.id)
+
+    page = await read_feed_page(prompt.id, 3, 0, 10)
+    assert [item["id"] for item in page.items] == [3, 2, 1]
+
+@pytest.mark.asyncio
+async def test_snapshot_pages_continue_through_news_without_display_order(sync_db, fake_redis):
+    prompt = _seed_feed(sync_db, [None, 1, None])
+    await write_feed_snapshot(sync_db, prompt.id)
+
+    first = await read_feed_page(prompt.id, 3, 0, 2)
+    assert [item["id"] for item in first.items] == [2, 1]
+    assert first.next_position == (None, 1)
+
+    second = await read_feed_page(prompt.id, 3, 0, 2, position=first.next_position)
+    assert [item["id"] for item in second.items] == [3]
+    assert second.next_position is None
+
+@pytest.mark.asyncio
+async def test_missing_snapshot_falls_back(sync_db, fake_redis):
+    prompt = _seed_feed(sync_db, [1])
+    await write_feed_snapshot(sync_db, prompt.id)
+
+    assert await read_feed_page(prompt.id, 4, 0, 10) is None
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import pytest
+from app.services.single_flight import SingleFlight
+
+@pytest.fixture
+def flight():
+    return SingleFlight(namespace="test", lease_ttl=30, wait_timeout=5, poll_interval=0.01)
+
+@pytest.mark.asyncio
+async def test_leader_holds_lease_while_working_and_releases_it(fake_redis, flight):
+    seen = {}
+
+    async def work():
+        seen["lease"] = await fake_redis.get(flight._lease_key("prompt-1"))
+        return {"stored": 3}
+
+    result = await flight.run("prompt-1", work)
+
+    assert result == {"stored": 3}
+    assert seen["lease"] is not None
+    assert await fake_redis.exists(flight._lease_key("prompt-1")) == 0
+    assert json.loads(await fake_redis.get(flight._result_key("prompt-1"))) == {"stored": 3}
+
+@pytest.mark.asyncio
+async def test_lease_released_when_work_fails(fake_redis, flight):
+    async def work():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await flight.run("prompt-1", work)
+
+    assert await fake_redis.exists(flight._lease_key("prompt-1")) == 0
+
+@pytest.mark.asyncio
+async def test_release_keeps_lease_taken_over_by_another_worker(fake_redis, flight):
+    async def work():
+        await fake_redis.set(flight._lease_key("prompt-1"), "other-worker")
+        return None
+
+    await flight.run("prompt-1", work)
+
+    assert await fake_redis.get(flight._lease_key("prompt-1")) == b"other-worker"
+
+@pytest.mark.asyncio
+async def test_follower_in_process_joins_leader(fake_redis, flight):
+    calls = 0
+    release = asyncio.Event()
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"stored": 1}
+
+    leader = asyncio.create_task(flight.run("prompt-1", work))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.run("prompt-1", work))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(leader, follower) == [{"stored": 1}, {"stored": 1}]
+    assert calls == 1
+
+@pytest.mark.asyncio
+async def test_follower_in_other_process_reads_leader_result(fake_redis, flight):
+    # A separate instance has its own in-flight map, like another worker
+    other = SingleFlight(namespace="test", lease_ttl=30, wait_timeout=5, poll_interval=0.01)
+    leader_started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def leader_work():
+        leader_started.set()
+        await release.wait()
+        return {"stored": 2}
+
+    async def follower_work():
+        raise AssertionError("follower must not run the work")
+
+    leader = asyncio.create_task(flight.run("prompt-1", leader_work))
+    await leader_started.wait()
+    follower = asyncio.create_task(other.run("prompt-1", follower_work))
+    await asyncio.sleep(0.05)
+    release.set()
+
+    assert await leader == {"stored": 2}
+    assert await follower == {"stored": 2}
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime
+import pytest
+from app.models.prompt import Prompt
+from app.services.sources.base import NewsSource, merge_sources
+
+class CountingSource(NewsSource):
+    """
+    Yields numbered items without pausing, like a source serving a cache
+    """
+    def __init__(self, name: str, count: int = 200):
+        super().__init__(name)
+        self.count = count
+        self.closed = False
+
+    async def iter_articles(self, prompt, max_articles, since=None):
+        try:
+            for index in range(self.count):
+                await asyncio.sleep(0)
+                yield {
+                    'url': f"https://{self.name}.example.com/{index}",
+                    'published_at': datetime(2024, 1, 1)
+                }
+        finally:
+            self.closed = True
+
+def _prompt() -> Prompt:
+    return Prompt(id=1, prompt_text="Summarize")
+
+@pytest.mark.asyncio
+async def test_merge_counts_only_accepted_items():
+    sources = [CountingSource("a", 20), CountingSource("b", 20)]
+    accepted = lambda item: not item['url'].endswith(("/0", "/1"))
+
+    items = [item async for item in merge_sources(sources, _prompt(), 10, accept=accepted)]
+
+    assert len(items) == 10
+    assert all(accepted(item) for item in items)
+    assert all(source.closed for source in sources)
+
+@pytest.mark.asyncio
+async def test_merge_stops_sources_when_the_consumer_goes_away():
+    sources = [CountingSource("a"), CountingSource("b")]
+    merged = merge_sources(sources, _prompt(), 100)
+
+    await merged.__anext__()
+    # Both sources have since filled the queue
+    await asyncio.sleep(0.01)
+    await asyncio.wait_for(merged.aclose(), timeout=1)
+
+    assert all(source.closed for source in sources)
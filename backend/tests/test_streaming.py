@@ -0,0 +1,59 @@
+import asyncio
+import json
+import pytest
+from app.api.v1.endpoints.news import _stream_transformation
+from app.core.llm.base import BaseLLM, LLMResponse
+from app.models.news import News
+from app.models.prompt import Prompt
+from app.services.news_collector import get_provider_semaphore
+
+class ChunkedLLM(BaseLLM):
+    def __init__(self, chunks, fail: bool = False):
+        self.chunks = chunks
+        self.fail = fail
+
+    async def generate(self, prompt: str, system_prompt: str = None, **kwargs) -> LLMResponse:
+        return LLMResponse(content="".join(self.chunks))
+
+    async def generate_stream(self, prompt: str, system_prompt: str = None, **kwargs):
+        for chunk in self.chunks:
+            await asyncio.sleep(0)
+            yield LLMResponse(content=chunk)
+        if self.fail:
+            raise RuntimeError("backend went away")
+
+    async def health_check(self) -> bool:
+        return True
+
+def _event(raw: str):
+    name, data = raw.strip().split("\n")
+    return name.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+def _inputs(provider: str):
+    prompt = Prompt(id=1, prompt_text="Rewrite", llm_provider=provider)
+    news = News(id=1, title="Title", content="Body")
+    return news, prompt
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_hold_the_provider_slot():
+    news, prompt = _inputs("stream-slow-client")
+    semaphore = get_provider_semaphore("stream-slow-client")
+    free = semaphore._value
+
+    stream = _stream_transformation(ChunkedLLM(["a", "b", "c"]), news, prompt)
+    assert _event(await stream.__anext__()) == ("token", {"content": "a"})
+
+    # The client stalls; generation finishes and gives the slot back
+    await asyncio.sleep(0.01)
+    assert semaphore._value == free
+
+    assert _event(await stream.__anext__()) == ("token", {"content": "b"})
+    await stream.aclose()
+
+@pytest.mark.asyncio
+async def test_generation_error_is_sent_as_an_event():
+    news, prompt = _inputs("stream-error")
+
+    events = [_event(raw) async for raw in _stream_transformation(ChunkedLLM(["a"], fail=True), news, prompt)]
+
+    assert events == [("token", {"content": "a"}), ("error", {"detail": "backend went away"})]
@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import List
+import pytest
+from pydantic import ValidationError
+from app.core.llm.base import BaseLLM, LLMResponse
+from app.models.prompt import Prompt
+from app.services.news_collector import NewsCollector
+
+class ScriptedLLM(BaseLLM):
+    """
+    Returns canned responses in order and records the prompts it was given
+    """
+    def __init__(self, responses: List[str]):
+        self.responses = list(responses)
+        self.prompts: List[str] = []
+
+    async def generate(self, prompt: str, system_prompt: str = None, **kwargs) -> LLMResponse:
+        self.prompts.append(prompt)
+        return LLMResponse(content=self.responses.pop(0))
+
+    async def health_check(self) -> bool:
+        return True
+
+class StubFactory:
+    def __init__(self, llm: BaseLLM):
+        self.llm = llm
+
+    def create(self, provider=None, llm_config=None) -> BaseLLM:
+        return self.llm
+
+def _collector(llm: BaseLLM) -> NewsCollector:
+    collector = NewsCollector(db=None)
+    collector.llm_factory = StubFactory(llm)
+    return collector
+
+def _prompt() -> Prompt:
+    return Prompt(
+        id=1,
+        prompt_text="Rewrite for engineers",
+        llm_provider="openai",
+        llm_config={"structured_processing": True},
+        source_preferences={}
+    )
+
+def _news_item() -> dict:
+    return {
+        'title': "Release",
+        'content': "A new version was released.",
+        'source': "Test",
+        'url': "https://example.com/release",
+        'published_at': datetime(2024, 1, 1),
+        'raw_data': {}
+    }
+
+def test_parse_structured_response_tolerates_code_fences():
+    content = '```json\n{"transformed_content": "Hi", "relevance_score": 0.8, "sentiment_score": 1}\n```'
+    result = _collector(ScriptedLLM([]))._parse_structured_response(content)
+    assert result.transformed_content == "Hi"
+    assert result.relevance_score == 0.8
+    assert result.sentiment_score == 1
+
+@pytest.mark.parametrize("content, error", [
+    ("Sorry, I can't help with that.", ValueError),
+    ('{"transformed_content": "Hi", "relevance_score": 0.8,', ValueError),
+    ('{"transformed_content": "Hi", "relevance_score": 0.8, "sentiment_score": }', ValueError),
+    ('{"transformed_content": "Hi", "relevance_score": 3, "sentiment_score": 0}', ValidationError),
+    ('{"transformed_content": "", "relevance_score": 0.5, "sentiment_score": 0}', ValidationError),
+    ('{"relevance_score": 0.5, "sentiment_score": 0}', ValidationError),
+])
+def test_parse_structured_response_rejects_malformed_output(content, error):
+    with pytest.raises(error):
+        _collector(ScriptedLLM([]))._parse_structured_response(content)
+
+@pytest.mark.asyncio
+async def test_malformed_structured_response_falls_back_to_separate_calls():
+    llm = ScriptedLLM([
+        '{"transformed_content": "Half a respo',  # structured call
+        "Rewritten article",  # transformation
+        "0.7",  # relevance
+        "-1",  # sentiment
+    ])
+
+    result = await _collector(llm)._process_news_item(_news_item(), llm, _prompt())
+
+    assert len(llm.prompts) == 4
+    assert result['transformed_content'] == "Rewritten article"
+    assert result['relevance_score'] == 0.7
+    assert result['meta_info']['sentiment_score'] == -1
+    assert not result['meta_info'].get('structured')
+
+@pytest.mark.asyncio
+async def test_valid_structured_response_uses_a_single_call():
+    llm = ScriptedLLM(['{"transformed_content": "Rewritten", "relevance_score": 0.9, "sentiment_score": 0}'])
+
+    result = await _collector(llm)._process_news_item(_news_item(), llm, _prompt())
+
+    assert len(llm.prompts) == 1
+    assert result['transformed_content'] == "Rewritten"
+    assert result['relevance_score'] == 0.9
+    assert result['meta_info']['structured'] is True
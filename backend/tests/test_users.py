@@ -0,0 +1,20 @@
+import pytest
+from fastapi import HTTPException, status
+from app.api.v1.endpoints import users as users_endpoints
+from app.schemas.user import UserCreate
+
+@pytest.mark.asyncio
+async def test_create_user_keeps_password_hashing_back_pressure(db, monkeypatch):
+    async def saturated(password: str) -> str:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry",
+            headers={"Retry-After": "1"},
+        )
+    monkeypatch.setattr(users_endpoints, "get_password_hash_async", saturated)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await users_endpoints.create_user(UserCreate(email="new@example.com", password="secret"), db)
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "1"}
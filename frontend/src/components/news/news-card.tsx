@@ -1,16 +1,18 @@
 import React from 'react';
+import { useQuery } from '@tanstack/react-query';
 import { Card, CardContent, CardFooter, CardHeader, CardTitle } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { Sheet, SheetContent, SheetDescription, SheetHeader, SheetTitle, SheetTrigger } from '@/components/ui/sheet';
 import { ScrollArea } from '@/components/ui/scroll-area';
 import { Badge } from '@/components/ui/badge';
 import { Newspaper, ExternalLink, Clock } from 'lucide-react';
+import { newsApi } from '@/lib/api';
 
 interface NewsCardProps {
   news: {
     id: number;
     title: string;
-    content: string;
+    content?: string;
     summary: string;
     source: string;
     url: string;
@@ -19,10 +21,23 @@ interface NewsCardProps {
     transformed_content?: string;
     relevance_score?: number;
   };
+  promptId: number;
   viewType: 'list' | 'grid';
 }
 
-export const NewsCard = ({ news, viewType }: NewsCardProps) => {
+export const NewsCard = ({ news, promptId, viewType }: NewsCardProps) => {
+  const [open, setOpen] = React.useState(false);
+
+  // Feed items are summaries; the full article is fetched when the sheet opens
+  const { data: article, isLoading: articleLoading } = useQuery({
+    queryKey: ['article', promptId, news.id],
+    queryFn: () => newsApi.getPromptArticle({ promptId, newsId: news.id }),
+    enabled: open,
+  });
+
+  const content = article?.content ?? news.content;
+  const transformedContent = article?.transformations?.[0]?.transformed_content ?? news.transformed_content;
+
   return (
     <Card className={viewType === 'list' ? 'flex flex-col md:flex-row' : ''}>
       <div className={viewType === 'list' ? 'flex-1' : ''}>
@@ -57,7 +72,7 @@ export const NewsCard = ({ news, viewType }: NewsCardProps) => {
       </div>
 
       <CardFooter className={`${viewType === 'list' ? 'flex-col justify-end gap-2 p-6' : 'flex justify-between'}`}>
-        <Sheet>
+        <Sheet open={open} onOpenChange={setOpen}>
           <SheetTrigger asChild>
             <Button variant="outline" size="sm">
               <Newspaper className="w-4 h-4 mr-2" />
@@ -73,12 +88,14 @@ export const NewsCard = ({ news, viewType }: NewsCardProps) => {
               <div className="space-y-6">
                 <div>
                   <h3 className="font-semibold mb-2">Original</h3>
-                  <p className="text-sm text-muted-foreground">{news.content}</p>
+                  <p className="text-sm text-muted-foreground">
+                    {articleLoading ? 'Loading...' : content}
+                  </p>
                 </div>
-                {news.transformed_content && (
+                {transformedContent && (
                   <div>
                     <h3 className="font-semibold mb-2">Transformed</h3>
-                    <p className="text-sm text-muted-foreground">{news.transformed_content}</p>
+                    <p className="text-sm text-muted-foreground">{transformedContent}</p>
                   </div>
                 )}
               </div>
@@ -11,7 +11,7 @@ import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
 interface NewsItem {
   id: number;
   title: string;
-  content: string;
+  content?: string;
   summary: string;
   source: string;
   url: string;
@@ -119,6 +119,7 @@ const NewsFeed = () => {
                 <NewsCard 
                   key={item.id}
                   news={item}
+                  promptId={activePrompt || 0}
                   viewType="list"
                 />
               ))}
@@ -137,6 +138,7 @@ const NewsFeed = () => {
                 <NewsCard 
                   key={item.id}
                   news={item}
+                  promptId={activePrompt || 0}
                   viewType="grid"
                 />
               ))}
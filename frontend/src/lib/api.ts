@@ -193,6 +193,23 @@ export const newsApi = {
     }
   },
 
+  getPromptArticle: async ({ promptId, newsId }: {
+    promptId: number;
+    newsId: number;
+  }) => {
+    try {
+      const response = await api.get(`/news/prompt/${promptId}/article/${newsId}`);
+      return response.data;
+    } catch (error) {
+      if (error instanceof AxiosError) {
+        if (error.response?.data?.detail) {
+          throw new Error(error.response.data.detail);
+        }
+      }
+      throw error;
+    }
+  },
+
   getPromptCategories: async (promptId: number) => {
     try {
       const response = await api.get(`/news/prompt/${promptId}/categories`);